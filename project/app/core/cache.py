@@ -0,0 +1,135 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Hierarchy cache lookups by entity and result.", labelnames=("entity", "result")
+)
+
+MISSING = object()
+
+
+class LRUCache:
+    """In-process TTL + LRU cache. Each worker process holds its own copy."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class MemoryBackend:
+    """Shared-backend stand-in: stores JSON like Redis would, so tests see the same behavior."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return MISSING
+        return json.loads(entry[1])
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, json.dumps(value))
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend:
+    def __init__(self, url: str, ttl: float) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("CACHE_URL points to Redis but the 'redis' package is not installed") from exc
+        self.ttl = ttl
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Any:
+        raw = await self._client.get(f"cache:{key}")
+        return MISSING if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._client.set(f"cache:{key}", json.dumps(value), px=int(self.ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(f"cache:{key}" for key in keys))
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter("cache:*"):
+            await self._client.delete(key)
+
+
+def build_backend(url: Optional[str]):
+    if not url:
+        return LRUCache(settings.cache_max_entries, settings.cache_ttl)
+    if url.startswith("memory://"):
+        return MemoryBackend(settings.cache_ttl)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url, settings.cache_ttl)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+backend = build_backend(settings.cache_url)
+
+
+def cache_key(entity: str, key: Any) -> str:
+    return f"{entity}:{key}"
+
+
+async def cached(entity: str, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached JSON-compatible value, loading and storing it on a miss.
+
+    Loaders return None for rows that do not exist; those are not cached.
+    """
+    if not settings.cache_enabled:
+        return await loader()
+    full_key = cache_key(entity, key)
+    value = await backend.get(full_key)
+    if value is not MISSING:
+        CACHE_REQUESTS.inc(entity=entity, result="hit")
+        return value
+    CACHE_REQUESTS.inc(entity=entity, result="miss")
+    value = await loader()
+    if value is not None:
+        await backend.set(full_key, value)
+    return value
+
+
+async def invalidate(*keys: Tuple[str, Any]) -> None:
+    await backend.delete(*(cache_key(entity, key) for entity, key in keys))
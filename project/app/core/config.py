@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,6 +15,50 @@ class Settings(BaseSettings):
     db_pass: str
     db_name: str
 
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Milliseconds; 0 disables the server-side timeout.
+    db_statement_timeout: int = 0
+    # The modes the psycopg2 dialect accepts; validated when settings load.
+    db_executemany_mode: Literal["values_only", "values_plus_batch"] = "values_plus_batch"
+
+    # "check" only verifies the stored schema version; "migrate" applies pending
+    # migrations on boot and is meant for single-process development setups.
+    schema_startup_mode: Literal["check", "migrate"] = "check"
+
+    cache_enabled: bool = True
+    cache_ttl: float = 300.0
+    cache_max_entries: int = 4096
+    # Empty keeps the cache in-process; redis://... shares it across workers and
+    # memory:// selects the in-memory stand-in for the shared backend.
+    cache_url: Optional[str] = None
+
+    # Sent with every ETag; CACHE_CONTROL_ROUTES maps route paths (as declared,
+    # e.g. "/grades/{grade_id}/tree") to their own value, as a JSON object.
+    cache_control: str = "private, no-cache"
+    cache_control_routes: Dict[str, str] = {}
+
+    # The first scheme hashes new passwords; the rest are only verified and get
+    # rehashed on the next successful login, as do hashes with other rounds.
+    password_hash_schemes: List[str] = ["bcrypt_sha256"]
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 2
+    login_max_concurrency: int = 32
+
+    jwt_secret: Optional[str] = None
+    access_token_ttl: int = 900
+    refresh_token_ttl: int = 14 * 24 * 3600
+
+    # Development/CI aid: warns when one statement shape runs more than
+    # QUERY_REPEAT_THRESHOLD times in a request and logs EXPLAIN for statements
+    # slower than SLOW_QUERY_MS.
+    query_debug: bool = False
+    query_repeat_threshold: int = 5
+    slow_query_ms: float = 100.0
+
     model_config = SettingsConfigDict(env_file=str(ENV_FILE_PATH), env_file_encoding="utf-8")
 
 
@@ -0,0 +1,55 @@
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.connection import get_async_db
+from app.services.common import get_versions
+
+
+def weak_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both sides.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def conditional_get(*models: Any, cache_control: Optional[str] = None) -> Callable:
+    """Dependency that answers 304 from the table_versions counters of the given models.
+
+    Runs before the handler, so a match never loads rows or serializes a response.
+    The validator headers are returned for handlers that build their own Response;
+    the counters are left in ``request.state.table_versions`` so cached reads can
+    check their entries against the same versions the ETag was built from.
+    """
+    tables = tuple(model.__tablename__ for model in models)
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> Dict[str, str]:
+        versions = await get_versions(db, *tables)
+        request.state.table_versions = dict(zip(tables, versions))
+        etag = weak_etag(*versions)
+        route = request.scope.get("route")
+        default = cache_control or settings.cache_control
+        headers = {
+            "ETag": etag,
+            "Cache-Control": settings.cache_control_routes.get(getattr(route, "path", ""), default),
+        }
+        if etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return headers
+
+    return dependency
@@ -0,0 +1,58 @@
+import csv
+import io
+import time
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Sequence
+
+import orjson
+
+from app.core.instrumentation import add_serialization_time
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        # Same UTC spelling as the JSON responses.
+        return value.isoformat().replace("+00:00", "Z")
+    return value
+
+
+def encode_ndjson(columns: List[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def encode_rows(
+    data_format: str, columns: List[str], batches: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[bytes]:
+    if data_format == "csv":
+        yield encode_csv([columns])
+    async for rows in batches:
+        start = time.perf_counter()
+        chunk = encode_csv(rows) if data_format == "csv" else encode_ndjson(columns, rows)
+        add_serialization_time(time.perf_counter() - start)
+        yield chunk
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    # wbits=31 writes a gzip header; each batch is compressed as it goes through.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,254 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", labelnames=("method", "route")
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "SQL statements executed per request.",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_ROWS = Histogram(
+    "http_request_rows",
+    "Rows returned by SQL per request, as reported by the driver.",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000),
+)
+REQUEST_SERIALIZATION_SECONDS = Histogram(
+    "http_request_serialization_seconds",
+    "Time spent encoding response bodies per request.",
+    labelnames=("method", "route"),
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "rows", "db_time", "hash_time", "serialization_time", "statements")
+
+    def __init__(self, track_statements: bool = False) -> None:
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.hash_time = 0.0
+        self.serialization_time = 0.0
+        # Executions per statement shape; only kept in query debug mode or under a budget.
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        if self.statements is None:
+            return []
+        return [(shape, count) for shape, count in self.statements.most_common() if count > threshold]
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            [
+                f"total;dur={total * 1000:.2f}",
+                f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries, {self.rows} rows"',
+                f"hash;dur={self.hash_time * 1000:.2f}",
+                f"serialize;dur={self.serialization_time * 1000:.2f}",
+            ]
+        )
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def add_hash_time(seconds: float) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.hash_time += seconds
+
+
+def add_serialization_time(seconds: float) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.serialization_time += seconds
+
+
+_PLACEHOLDER = re.compile(r"\$\d+(?:::\w+)?|%\(\w+\)s|%s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with placeholders unified and expanded IN lists collapsed."""
+    shape = _PLACEHOLDER.sub("?", " ".join(statement.split()))
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+def _explain(conn, statement: str, parameters: Any) -> str:
+    # Runs on a raw DBAPI cursor so the EXPLAIN itself is not instrumented.
+    prefix = "EXPLAIN " if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _log_slow_query(conn, statement: str, parameters: Any, elapsed: float, executemany: bool) -> None:
+    plan = ""
+    if not executemany and statement.lstrip()[:6].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as exc:  # the plan is best effort; the query itself succeeded
+            plan = f"EXPLAIN failed: {exc}"
+    logger.warning("Slow query (%.1f ms): %s\n%s", elapsed * 1000, " ".join(statement.split()), plan)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    if settings.query_debug and elapsed * 1000 >= settings.slow_query_ms:
+        _log_slow_query(conn, statement, parameters, elapsed, executemany)
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_time += elapsed
+    if stats.statements is not None:
+        stats.statements[statement_shape(statement)] += 1
+    # asyncpg and psycopg2 report the fetched row count for SELECTs; SQLite reports -1.
+    if cursor.description is not None and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def _handle_error(exception_context: Any) -> None:
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    # The async engine runs these sync listeners inside the request task's context,
+    # so the ContextVar set by the middleware is visible here.
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware: Server-Timing header plus per-route histograms.
+
+    The header is written when the response starts; the histograms are observed at
+    the last body chunk, so streamed responses are measured in full while
+    background tasks that run afterwards are not.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(track_statements=settings.query_debug or bool(_budgets))
+        token = _current_stats.set(stats)
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started_at))
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._observe(scope, stats, status_code, time.perf_counter() - started_at)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current_stats.reset(token)
+
+    @staticmethod
+    def _observe(scope: Scope, stats: RequestStats, status_code: int, total: float) -> None:
+        route = scope.get("route")
+        # Unmatched paths share one label to keep the series count bounded.
+        labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+        if settings.query_debug:
+            for shape, count in stats.repeated_statements(settings.query_repeat_threshold):
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %d times: %s",
+                    labels["method"], labels["route"], count, shape,
+                )
+        for budget in list(_budgets):
+            budget.requests.append((f"{labels['method']} {labels['route']}", stats))
+        REQUEST_SECONDS.observe(total, status=str(status_code), **labels)
+        REQUEST_DB_SECONDS.observe(stats.db_time, **labels)
+        REQUEST_QUERIES.observe(stats.queries, **labels)
+        REQUEST_ROWS.observe(stats.rows, **labels)
+        REQUEST_SERIALIZATION_SECONDS.observe(stats.serialization_time, **labels)
+
+
+class QueryBudget:
+    def __init__(self, max_queries: int) -> None:
+        self.max_queries = max_queries
+        # Statements run directly inside the block, outside any request.
+        self.direct = RequestStats(track_statements=True)
+        self.requests: List[Tuple[str, RequestStats]] = []
+
+    def violations(self) -> List[str]:
+        measured = [("direct calls", self.direct)] if self.direct.queries else []
+        messages = []
+        for name, stats in measured + self.requests:
+            if stats.queries > self.max_queries:
+                statements = "\n".join(
+                    f"  {count}x {shape}" for shape, count in (stats.statements or Counter()).most_common()
+                )
+                messages.append(f"{name}: {stats.queries} queries (budget {self.max_queries})\n{statements}")
+        return messages
+
+
+_budgets: List[QueryBudget] = []
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryBudget]:
+    """Fail with AssertionError if any request made inside the block runs more than
+    ``max_queries`` statements; so do service calls awaited directly in the block.
+
+        with query_budget(2):
+            client.get(f"/courses/{course_id}/books/")
+    """
+    budget = QueryBudget(max_queries)
+    _budgets.append(budget)
+    token = _current_stats.set(budget.direct)
+    try:
+        yield budget
+    finally:
+        _current_stats.reset(token)
+        _budgets.remove(budget)
+    violations = budget.violations()
+    if violations:
+        raise AssertionError("Query budget exceeded:\n" + "\n".join(violations))
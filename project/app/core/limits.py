@@ -0,0 +1,18 @@
+class ConcurrencyLimiter:
+    """Non-blocking in-flight counter: callers over the limit are rejected, not queued.
+
+    Only safe to share between coroutines on the same event loop.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
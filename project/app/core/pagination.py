@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_keyset_cursor(values: Sequence[Any]) -> str:
+    # For orderings on several columns, e.g. (full_name, id).
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(type(value) is expected for value, expected in zip(values, types))
+    ):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,28 @@
+import time
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+from app.core.instrumentation import add_serialization_time
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Serialize already-shaped dicts/lists without a response_model validation pass.
+
+    OPT_UTC_Z writes UTC datetimes as ``...Z``, the same format pydantic emits.
+    """
+    start = time.perf_counter()
+    body = orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    add_serialization_time(time.perf_counter() - start)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+class TimedJSONResponse(JSONResponse):
+    """Default response class; records the JSON encoding time of response_model routes."""
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        add_serialization_time(time.perf_counter() - start)
+        return body
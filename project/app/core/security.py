@@ -1,6 +1,22 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+from app.core.config import settings
+from app.core.instrumentation import add_hash_time
+
+pwd_context = CryptContext(
+    schemes=settings.password_hash_schemes,
+    deprecated="auto",
+    bcrypt_sha256__rounds=settings.password_hash_rounds,
+)
+
+T = TypeVar("T")
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +25,44 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
+
+
+def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    # bcrypt holds the CPU for hundreds of milliseconds; separate processes keep
+    # that work off the event loop and out of the GIL.
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def _run_in_hash_pool(function: Callable[..., T], *args: str) -> T:
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(get_hash_executor(), function, *args)
+    finally:
+        add_hash_time(time.perf_counter() - start)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, password, hashed_password)
+
+
+async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update, password, hashed_password)
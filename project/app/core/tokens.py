@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from typing import Any, Dict
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+if settings.jwt_secret:
+    _secret = settings.jwt_secret.encode()
+else:
+    # Tokens signed with a per-process key stop verifying after a restart and are
+    # rejected by other workers, so production must set JWT_SECRET.
+    logger.warning("JWT_SECRET is not set; using a random key for this process")
+    _secret = secrets.token_bytes(32)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+_HEADER = _b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
+def _sign(signing_input: str) -> str:
+    # UTF-8 rather than ASCII so a tampered token fails verification instead of raising.
+    return _b64encode(hmac.new(_secret, signing_input.encode(), hashlib.sha256).digest())
+
+
+def create_token(user_id: int, role: str, token_type: str) -> str:
+    ttl = settings.access_token_ttl if token_type == ACCESS_TOKEN else settings.refresh_token_ttl
+    now = int(time.time())
+    claims = {"sub": str(user_id), "role": role, "type": token_type, "iat": now, "exp": now + ttl}
+    signing_input = f"{_HEADER}.{_b64encode(orjson.dumps(claims))}"
+    return f"{signing_input}.{_sign(signing_input)}"
+
+
+def decode_token(token: str, token_type: str) -> Dict[str, Any]:
+    """Verify an HS256 token signed by this API and return its claims.
+
+    Only the signature and expiry are checked, so no database access is needed.
+    """
+    try:
+        header, payload, signature = token.split(".")
+    except ValueError:
+        raise ValueError("Malformed token") from None
+    # compare_digest only accepts ASCII str, so compare the encoded bytes.
+    expected = _sign(f"{header}.{payload}").encode()
+    if header != _HEADER or not hmac.compare_digest(signature.encode(), expected):
+        raise ValueError("Invalid token signature")
+    try:
+        claims = orjson.loads(_b64decode(payload))
+    except (ValueError, orjson.JSONDecodeError):
+        raise ValueError("Malformed token") from None
+    if claims.get("type") != token_type:
+        raise ValueError("Wrong token type")
+    if claims.get("exp", 0) <= time.time():
+        raise ValueError("Token expired")
+    return claims
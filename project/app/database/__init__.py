@@ -1,4 +1,19 @@
 from app.database.base import Base
-from app.database.connection import SessionLocal, engine, get_db
+from app.database.connection import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+)
 
-__all__ = ["Base", "SessionLocal", "engine", "get_db"]
+__all__ = [
+    "Base",
+    "SessionLocal",
+    "AsyncSessionLocal",
+    "engine",
+    "async_engine",
+    "get_db",
+    "get_async_db",
+]
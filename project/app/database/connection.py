@@ -1,17 +1,107 @@
+import time
+from typing import Type
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import Counter, Gauge, Histogram
 
 
 DATABASE_URL = (
     f"postgresql+psycopg2://{settings.db_user}:{settings.db_pass}"
     f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
 )
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{settings.db_user}:{settings.db_pass}"
+    f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
+)
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent checking a connection out of the pool, including waits for a free slot.",
+    labelnames=("engine",),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout because the pool was exhausted.",
+    labelnames=("engine",),
+)
+
+
+def _instrumented_pool(base: Type[QueuePool], label: str) -> Type[QueuePool]:
+    class InstrumentedPool(base):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            except PoolTimeoutError:
+                POOL_CHECKOUT_TIMEOUTS.inc(engine=label)
+                raise
+            finally:
+                POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, engine=label)
+
+    InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+POOL_OPTIONS = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
+
+sync_connect_args = {}
+async_connect_args = {}
+if settings.db_statement_timeout:
+    sync_connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout}"
+    async_connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout)}
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    poolclass=_instrumented_pool(QueuePool, "sync"),
+    executemany_mode=settings.db_executemany_mode,
+    connect_args=sync_connect_args,
+    **POOL_OPTIONS,
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    poolclass=_instrumented_pool(AsyncAdaptedQueuePool, "async"),
+    connect_args=async_connect_args,
+    **POOL_OPTIONS,
+)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
+def _pool_usage():
+    for label, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        capacity = pool.size() + max(settings.db_max_overflow, 0)
+        yield (label, "checked_out"), pool.checkedout()
+        yield (label, "overflow"), max(pool.overflow(), 0)
+        yield (label, "capacity"), capacity
+        yield (label, "saturation"), pool.checkedout() / capacity if capacity else 0.0
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+
+Gauge(
+    "db_pool_connections",
+    "Pool usage: checked out and overflow connections, capacity and checked_out/capacity.",
+    _pool_usage,
+    labelnames=("engine", "state"),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects must stay readable after commit without triggering implicit IO.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
 def get_db():
@@ -20,3 +110,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
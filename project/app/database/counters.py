@@ -0,0 +1,61 @@
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Update
+
+from app.models.book import Book
+from app.models.course import Course
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.table_version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+# Denormalized counter columns and the foreign key of the rows they count.
+COUNTERS = (
+    (Course.book_count, Book.course_id),
+    (Section.student_count, StudentSection.section_id),
+)
+
+
+def _recount(column: Any, child_key: Any) -> Update:
+    model = column.class_
+    actual = select(func.count()).where(child_key == model.id).scalar_subquery()
+    # Only rows that drifted are written, so a clean run takes no row locks.
+    return update(model).where(column != actual).values({column: actual})
+
+
+def recount_statements() -> List[Update]:
+    return [_recount(column, child_key) for column, child_key in COUNTERS]
+
+
+def reconcile(engine: Engine) -> Dict[str, int]:
+    """Recount every counter column and return how many rows had drifted, per counter."""
+    fixed = {}
+    for (column, child_key), statement in zip(COUNTERS, recount_statements()):
+        table = column.class_.__tablename__
+        with engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                # Blocks writes to the counted table (not reads) until the recount
+                # commits, so rows written meanwhile cannot be missed or double counted.
+                connection.execute(text(f"LOCK TABLE {child_key.class_.__tablename__} IN SHARE MODE"))
+            count = connection.execute(statement).rowcount
+            if count:
+                connection.execute(
+                    update(TableVersion)
+                    .where(TableVersion.table_name == table)
+                    .values(version=TableVersion.version + 1)
+                )
+        fixed[f"{table}.{column.key}"] = count
+        if count:
+            logger.warning("Fixed %s drifted %s.%s counters", count, table, column.key)
+    return fixed
+
+
+if __name__ == "__main__":
+    from app.database.connection import engine
+
+    logging.basicConfig(level=logging.INFO)
+    print(reconcile(engine))
@@ -0,0 +1,182 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, func, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex, DropIndex
+
+# Import models so that Base.metadata describes the full schema.
+from app import models  # noqa: F401
+from app.database.base import Base
+from app.database.counters import COUNTERS, recount_statements
+from app.models.book import SEARCH_VECTOR_SQL, Book
+from app.models.course import Course
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.table_version import TableVersion
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+schema_metadata = MetaData()
+schema_version_table = Table(
+    "schema_version", schema_metadata, Column("version", Integer, nullable=False)
+)
+
+# Arbitrary advisory lock key shared by every process that runs migrations.
+MIGRATION_LOCK_ID = 4817309
+
+# Installed before any step runs, since the model metadata depends on them.
+POSTGRES_EXTENSIONS = ("pg_trgm",)
+
+
+def _create_indexes(connection: Connection, table: Table, *names: str) -> None:
+    # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes.
+    for index in table.indexes:
+        if index.name in names:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _initial_schema(connection: Connection) -> None:
+    Base.metadata.create_all(bind=connection)
+
+
+def _users_role_index(connection: Connection) -> None:
+    _create_indexes(connection, User.__table__, "ix_users_role_id")
+
+
+def _book_search(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(
+        text(
+            "ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+    )
+    _create_indexes(connection, Book.__table__, "ix_books_search_vector", "ix_books_author_trgm")
+
+
+# Foreign-key and listing indexes added by step 4, by table.
+LISTING_INDEXES = {
+    Book.__table__: ("ix_books_course_id_id", "ix_books_created_by"),
+    Course.__table__: ("ix_courses_section_id_id", "ix_courses_teacher_id_id"),
+    Section.__table__: ("ix_sections_grade_id_id",),
+    StudentSection.__table__: ("ix_student_sections_section_id_student_id",),
+}
+
+
+def _listing_indexes(connection: Connection) -> None:
+    for table, names in LISTING_INDEXES.items():
+        _create_indexes(connection, table, *names)
+
+
+def _table_versions(connection: Connection) -> None:
+    TableVersion.__table__.create(bind=connection, checkfirst=True)
+    present = set(connection.scalars(select(TableVersion.table_name)))
+    missing = [
+        {"table_name": table.name, "version": 0}
+        for table in Base.metadata.sorted_tables
+        if table.name not in present and table is not TableVersion.__table__
+    ]
+    if missing:
+        connection.execute(insert(TableVersion), missing)
+
+
+def _users_email_lower_index(connection: Connection) -> None:
+    _create_indexes(connection, User.__table__, "ix_users_email_lower")
+
+
+def _counter_columns(connection: Connection) -> None:
+    for column, _ in COUNTERS:
+        table = column.class_.__table__
+        if column.key not in {existing["name"] for existing in inspect(connection).get_columns(table.name)}:
+            ddl = CreateColumn(table.c[column.key]).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+    for statement in recount_statements():
+        connection.execute(statement)
+
+
+def _users_full_name_index(connection: Connection) -> None:
+    _create_indexes(connection, User.__table__, "ix_users_full_name_id")
+
+
+def _users_email_lower_unique(connection: Connection) -> None:
+    # Version 6 created the index without UNIQUE; rebuild it once duplicates are ruled out.
+    duplicates = connection.execute(
+        select(func.lower(User.email))
+        .group_by(func.lower(User.email))
+        .having(func.count() > 1)
+        .limit(5)
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Emails differing only in case must be merged before migrating: " + ", ".join(duplicates)
+        )
+    index = next(index for index in User.__table__.indexes if index.name == "ix_users_email_lower")
+    connection.execute(DropIndex(index, if_exists=True))
+    connection.execute(CreateIndex(index))
+
+
+# Append new steps with the next version number. Version 1 builds the schema from
+# the current models, so later steps must be idempotent (IF NOT EXISTS / checkfirst).
+MIGRATIONS: List[Tuple[int, Callable[[Connection], None]]] = [
+    (1, _initial_schema),
+    (2, _users_role_index),
+    (3, _book_search),
+    (4, _listing_indexes),
+    (5, _table_versions),
+    (6, _users_email_lower_index),
+    (7, _counter_columns),
+    (8, _users_full_name_index),
+    (9, _users_email_lower_unique),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: Connection) -> Optional[int]:
+    if not inspect(connection).has_table(schema_version_table.name):
+        return None
+    return connection.scalar(select(schema_version_table.c.version))
+
+
+def migrate(engine: Engine) -> int:
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+            for extension in POSTGRES_EXTENSIONS:
+                connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+
+        schema_metadata.create_all(bind=connection)
+        current = connection.scalar(select(schema_version_table.c.version))
+        if current is None:
+            connection.execute(schema_version_table.insert().values(version=0))
+            current = 0
+
+        for version, step in MIGRATIONS:
+            if version > current:
+                logger.info("Applying schema migration %s", version)
+                step(connection)
+
+        if SCHEMA_VERSION > current:
+            connection.execute(schema_version_table.update().values(version=SCHEMA_VERSION))
+    return SCHEMA_VERSION
+
+
+def check_schema_version(engine: Engine) -> int:
+    with engine.connect() as connection:
+        current = get_schema_version(connection)
+    if current is None or current < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {SCHEMA_VERSION}. "
+            "Run `python -m app.database.migrations` before starting the API."
+        )
+    return current
+
+
+if __name__ == "__main__":
+    from app.database.connection import engine
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"Database schema at version {migrate(engine)}")
@@ -1,41 +1,72 @@
 import logging
 
 from fastapi import FastAPI
-from sqlalchemy import text
+from fastapi.responses import Response
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.database.base import Base
-from app.database.connection import engine
-
-# Import models so that SQLAlchemy is aware of them when creating tables.
-from app import models  # noqa: F401
-from app.routers import auth, book, course, grade, section, student_section, user
+from app.core.config import settings
+from app.core.instrumentation import RequestMetricsMiddleware
+from app.core.metrics import CONTENT_TYPE_LATEST, render_latest
+from app.core.responses import TimedJSONResponse
+from app.core.security import shutdown_hash_executor
+from app.database.connection import async_engine, engine
+from app.database.migrations import check_schema_version, migrate
+from app.routers import (
+    auth,
+    book,
+    book_search,
+    catalog,
+    course,
+    export,
+    grade,
+    report,
+    section,
+    student_section,
+    user,
+)
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="School Library API")
+app = FastAPI(title="School Library API", default_response_class=TimedJSONResponse)
+app.add_middleware(RequestMetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     try:
-        with engine.begin() as connection:
-            connection.execute(text("SELECT 1"))
-        Base.metadata.create_all(bind=engine)
-    except SQLAlchemyError as exc:
+        if settings.schema_startup_mode == "migrate":
+            migrate(engine)
+        else:
+            check_schema_version(engine)
+    except (SQLAlchemyError, RuntimeError) as exc:
         logger.exception("Database initialization failed")
         raise exc
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    shutdown_hash_executor()
+    await async_engine.dispose()
+
+
 @app.get("/health", tags=["Health"])
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics() -> Response:
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 app.include_router(auth.router)
 app.include_router(user.router)
 app.include_router(grade.router)
 app.include_router(section.router)
 app.include_router(course.router)
 app.include_router(book.router)
+app.include_router(book_search.router)
 app.include_router(student_section.router)
+app.include_router(catalog.router)
+app.include_router(export.router)
+app.include_router(report.router)
@@ -3,6 +3,7 @@ from app.models.course import Course
 from app.models.grade import Grade
 from app.models.section import Section
 from app.models.student_section import StudentSection
+from app.models.table_version import TableVersion
 from app.models.user import User
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "Course",
     "Book",
     "StudentSection",
+    "TableVersion",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -6,12 +6,18 @@ from app.database.base import Base
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_section_id_id", "section_id", "id"),
+        Index("ix_courses_teacher_id_id", "teacher_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(150), nullable=False)
     section_id = Column(Integer, ForeignKey("sections.id", ondelete="CASCADE"), nullable=False)
     teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Maintained by the book writes; see app/services/common.apply_counters.
+    book_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     section = relationship("Section", back_populates="courses")
     teacher = relationship("User", back_populates="taught_courses", foreign_keys=[teacher_id])
-    books = relationship("Book", back_populates="course")
+    books = relationship("Book", back_populates="course", order_by="Book.id")
@@ -10,4 +10,4 @@ class Grade(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True)
 
-    sections = relationship("Section", back_populates="grade")
+    sections = relationship("Section", back_populates="grade", order_by="Section.id")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -6,11 +6,14 @@ from app.database.base import Base
 
 class Section(Base):
     __tablename__ = "sections"
+    __table_args__ = (Index("ix_sections_grade_id_id", "grade_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     grade_id = Column(Integer, ForeignKey("grades.id", ondelete="CASCADE"), nullable=False)
+    # Maintained by the enrollment writes; see app/services/common.apply_counters.
+    student_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     grade = relationship("Grade", back_populates="sections")
-    courses = relationship("Course", back_populates="section")
+    courses = relationship("Course", back_populates="section", order_by="Course.id")
     student_sections = relationship("StudentSection", back_populates="section")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -6,7 +6,11 @@ from app.database.base import Base
 
 class StudentSection(Base):
     __tablename__ = "student_sections"
-    __table_args__ = (UniqueConstraint("student_id", "section_id", name="uq_student_section"),)
+    # uq_student_section already serves lookups by student_id.
+    __table_args__ = (
+        UniqueConstraint("student_id", "section_id", name="uq_student_section"),
+        Index("ix_student_sections_section_id_student_id", "section_id", "student_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.database.base import Base
+
+
+class TableVersion(Base):
+    """Per-table write counter, bumped in the same transaction as every write."""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
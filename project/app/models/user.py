@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,11 @@ from app.database.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_id", "role", "id"),
+        # Keyset pages of section rosters sorted by name.
+        Index("ix_users_full_name_id", "full_name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(255), nullable=False)
@@ -22,3 +27,7 @@ class User(Base):
         "Book", back_populates="creator", foreign_keys="Book.created_by"
     )
     student_sections = relationship("StudentSection", back_populates="student")
+
+
+# Emails are unique case-insensitively: login matches on lower(email) through this index.
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
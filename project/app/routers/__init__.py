@@ -1,3 +1,27 @@
-from app.routers import auth, book, course, grade, section, student_section, user
+from app.routers import (
+    auth,
+    book,
+    book_search,
+    catalog,
+    course,
+    export,
+    grade,
+    report,
+    section,
+    student_section,
+    user,
+)
 
-__all__ = ["auth", "user", "grade", "section", "course", "book", "student_section"]
+__all__ = [
+    "auth",
+    "user",
+    "grade",
+    "section",
+    "course",
+    "book",
+    "book_search",
+    "catalog",
+    "export",
+    "report",
+    "student_section",
+]
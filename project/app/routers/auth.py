@@ -1,22 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.database.connection import get_db
-from app.schemas.auth import LoginRequest, LoginResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.limits import ConcurrencyLimiter
+from app.core.tokens import ACCESS_TOKEN, decode_token
+from app.database.connection import get_async_db
+from app.schemas.auth import LoginRequest, LoginResponse, RefreshRequest, TokenClaims, TokenPair
+from app.schemas.user import UserRead
 from app.services import auth as auth_service
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+login_limiter = ConcurrencyLimiter(settings.login_max_concurrency)
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def limit_login_concurrency():
+    if not login_limiter.try_acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        login_limiter.release()
+
+
+def get_token_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> TokenClaims:
+    # Signature and expiry only: no database round trip per authenticated request.
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing bearer token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return TokenClaims(**decode_token(credentials.credentials, ACCESS_TOKEN))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from exc
+
 
-@router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(limit_login_concurrency)])
+async def login(
+    payload: LoginRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)
+) -> LoginResponse:
     try:
-        user = auth_service.authenticate_user(db, payload.email, payload.password)
+        user, new_hash = await auth_service.authenticate_user(db, payload.email, payload.password)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    if new_hash:
+        background_tasks.add_task(auth_service.rehash_password, user.id, user.password_hash, new_hash)
+
+    tokens = auth_service.issue_tokens(user.id, user.role)
+    return LoginResponse(
+        message="Login successful", user=UserRead.model_validate(user), **tokens.model_dump()
+    )
+
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(payload: RefreshRequest, db: AsyncSession = Depends(get_async_db)) -> TokenPair:
+    try:
+        tokens = await auth_service.refresh_tokens(db, payload.refresh_token)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+    if not tokens:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User no longer exists")
+    return tokens
+
 
-    return LoginResponse(message="Login successful", user=user)
+@router.get("/me", response_model=TokenClaims)
+async def me(claims: TokenClaims = Depends(get_token_claims)) -> TokenClaims:
+    return claims
@@ -1,36 +1,47 @@
-from typing import List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-
-from app.database.connection import get_db
-from app.schemas.book import BookCreate, BookRead, BookUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import conditional_get
+from app.core.ingest import detect_format, iter_csv_records, iter_ndjson_records
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.book import Book
+from app.models.course import Course
+from app.schemas.book import BookCreate, BookImportResult, BookRead, BookUpdate
 from app.services import book as book_service
-from app.services import course as course_service
 from app.services import user as user_service
 
 router = APIRouter(prefix="/courses/{course_id}/books", tags=["Books"])
 
 
-@router.get("/", response_model=List[BookRead])
-def list_books(course_id: int, db: Session = Depends(get_db)) -> List[BookRead]:
-    course = course_service.get_course_by_id(db, course_id)
-    if not course:
+async def _require_references(db: AsyncSession, course_id: int, created_by: Optional[int]) -> None:
+    course_exists, creator_exists = await book_service.check_references(db, course_id, created_by)
+    if not course_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-    books = book_service.get_books_by_course(db, course_id)
-    return books
+    if not creator_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
-@router.post("/", response_model=BookRead, status_code=status.HTTP_201_CREATED)
-def create_book(course_id: int, book_in: BookCreate, db: Session = Depends(get_db)) -> BookRead:
-    course = course_service.get_course_by_id(db, course_id)
-    if not course:
+@router.get("/", response_model=List[BookRead])
+async def list_books(
+    course_id: int,
+    validators: Dict[str, str] = Depends(conditional_get(Course, Book)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    books = await book_service.get_books_in_course(db, course_id)
+    if books is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    return json_response(books, validators)
 
-    creator = user_service.get_user_by_id(db, book_in.created_by)
-    if not creator:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.post("/", response_model=BookRead, status_code=status.HTTP_201_CREATED)
+async def create_book(
+    course_id: int, book_in: BookCreate, db: AsyncSession = Depends(get_async_db)
+) -> BookRead:
+    await _require_references(db, course_id, book_in.created_by)
 
     if book_in.course_id is not None and book_in.course_id != course_id:
         raise HTTPException(
@@ -39,22 +50,56 @@ def create_book(course_id: int, book_in: BookCreate, db: Session = Depends(get_d
 
     payload = BookCreate(**book_in.dict(exclude={"course_id"}, exclude_unset=True), course_id=course_id)
     try:
-        book = book_service.create_book(db, payload)
+        book = await book_service.create_book(db, payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IntegrityError:
+        # The course or creator can be deleted between the check above and the insert.
+        await db.rollback()
+        await _require_references(db, course_id, book_in.created_by)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to create book due to constraints"
+        )
     return book
 
 
+@router.post(
+    "/bulk",
+    response_model=BookImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_books(
+    course_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
+) -> BookImportResult:
+    data_format = detect_format(request.headers.get("content-type", ""))
+    if data_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use text/csv or application/x-ndjson",
+        )
+
+    await _require_references(db, course_id, None)
+
+    parse = iter_csv_records if data_format == "csv" else iter_ndjson_records
+    return await book_service.import_books(db, course_id, parse(request.stream()))
+
+
 @router.patch("/{book_id}", response_model=BookRead)
-def update_book(
-    course_id: int, book_id: int, book_in: BookUpdate, db: Session = Depends(get_db)
+async def update_book(
+    course_id: int, book_id: int, book_in: BookUpdate, db: AsyncSession = Depends(get_async_db)
 ) -> BookRead:
-    course = course_service.get_course_by_id(db, course_id)
-    if not course:
+    course_exists, book = await book_service.get_book_in_course(db, course_id, book_id)
+    if not course_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-
-    book = book_service.get_book_by_id(db, book_id)
-    if not book or book.course_id != course_id:
+    if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
 
     if book_in.course_id is not None and book_in.course_id != course_id:
@@ -63,15 +108,15 @@ def update_book(
         )
 
     if book_in.created_by is not None:
-        creator = user_service.get_user_by_id(db, book_in.created_by)
-        if not creator:
+        (creator_exists,) = await user_service.check_exists(db, book_in.created_by)
+        if not creator_exists:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     payload = BookUpdate(**book_in.dict(exclude={"course_id"}, exclude_unset=True), course_id=course_id)
     try:
-        book = book_service.update_book(db, book_id, payload)
+        book = await book_service.update_book(db, book_id, payload)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to update book due to constraints"
         )
@@ -82,19 +127,19 @@ def update_book(
 
 
 @router.delete("/{book_id}", response_model=BookRead, status_code=status.HTTP_200_OK)
-def delete_book(course_id: int, book_id: int, db: Session = Depends(get_db)) -> BookRead:
-    course = course_service.get_course_by_id(db, course_id)
-    if not course:
+async def delete_book(
+    course_id: int, book_id: int, db: AsyncSession = Depends(get_async_db)
+) -> BookRead:
+    course_exists, book = await book_service.get_book_in_course(db, course_id, book_id)
+    if not course_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-
-    book = book_service.get_book_by_id(db, book_id)
-    if not book or book.course_id != course_id:
+    if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
 
     try:
-        book = book_service.delete_book(db, book_id)
+        book = await book_service.delete_book(db, book_id)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete book because it is referenced by other records",
@@ -0,0 +1,42 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import conditional_get
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.database.connection import get_async_db
+from app.models.book import Book
+from app.models.course import Course
+from app.models.section import Section
+from app.schemas.book import BookSearchPage
+from app.services import book as book_service
+
+router = APIRouter(prefix="/books", tags=["Books"])
+
+MAX_SEARCH_OFFSET = 1000
+
+
+@router.get(
+    "/search",
+    response_model=BookSearchPage,
+    dependencies=[Depends(conditional_get(Book, Course, Section))],
+)
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    course_id: Optional[int] = None,
+    grade_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> BookSearchPage:
+    # Ask for one extra hit to know whether another page exists.
+    books, mode = await book_service.search_books(
+        db, q, limit=limit + 1, offset=offset, course_id=course_id, grade_id=grade_id
+    )
+    next_offset = None
+    if len(books) > limit:
+        books = books[:limit]
+        if mode == "fulltext" and offset + limit <= MAX_SEARCH_OFFSET:
+            next_offset = offset + limit
+    return BookSearchPage(items=books, mode=mode, next_offset=next_offset)
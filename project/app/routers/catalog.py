@@ -0,0 +1,95 @@
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import conditional_get
+from app.core.instrumentation import add_serialization_time
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.book import Book
+from app.models.course import Course
+from app.models.grade import Grade
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+from app.schemas.catalog import GradeTree, StudentLibrary
+from app.services import catalog as catalog_service
+
+router = APIRouter(tags=["Catalog"])
+
+tree_validators = conditional_get(Grade, Section, Course, Book)
+
+
+def _serialize_grades(grades: Iterable[Grade], as_list: bool) -> Iterator[bytes]:
+    # Each grade is dumped on its own so large catalogs never build one big string.
+    if as_list:
+        yield b"["
+    for index, grade in enumerate(grades):
+        if index:
+            yield b","
+        start = time.perf_counter()
+        body = GradeTree.model_validate(grade).model_dump_json().encode()
+        add_serialization_time(time.perf_counter() - start)
+        yield body
+    if as_list:
+        yield b"]"
+
+
+@router.get("/grades/{grade_id}/tree", response_model=GradeTree)
+async def get_grade_tree(
+    grade_id: int,
+    validators: Dict[str, str] = Depends(tree_validators),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    grade = await catalog_service.get_grade_tree(db, grade_id)
+    if not grade:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
+    return StreamingResponse(
+        _serialize_grades([grade], as_list=False), media_type="application/json", headers=validators
+    )
+
+
+@router.get("/catalog/tree", response_model=List[GradeTree])
+async def get_catalog_tree(
+    validators: Dict[str, str] = Depends(tree_validators), db: AsyncSession = Depends(get_async_db)
+) -> StreamingResponse:
+    grades = await catalog_service.get_catalog_tree(db)
+    return StreamingResponse(
+        _serialize_grades(grades, as_list=True), media_type="application/json", headers=validators
+    )
+
+
+@router.get("/users/{user_id}/library", response_model=StudentLibrary)
+async def get_student_library(
+    request: Request,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: Dict[str, str] = Depends(conditional_get(User, StudentSection, Section, Course, Book)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    try:
+        after_id = decode_cursor(cursor) if cursor else 0
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    library = await catalog_service.get_cached_library(db, user_id, request.state.table_versions)
+    if library is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    # Pages split the course list; every page repeats the student's sections.
+    courses = [course for course in library["courses"] if course["id"] > after_id]
+    next_cursor = encode_cursor(courses[limit - 1]["id"]) if len(courses) > limit else None
+    return json_response(
+        {
+            "student_id": user_id,
+            "sections": library["sections"],
+            "courses": courses[:limit],
+            "next_cursor": next_cursor,
+        },
+        validators,
+    )
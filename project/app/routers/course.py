@@ -1,36 +1,49 @@
-from typing import List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_db
+from app.core.etag import conditional_get
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.course import Course
+from app.models.section import Section
 from app.schemas.course import CourseCreate, CourseRead, CourseUpdate
 from app.services import course as course_service
-from app.services import section as section_service
 from app.services import user as user_service
 
 router = APIRouter(prefix="/sections/{section_id}/courses", tags=["Courses"])
 
 
-@router.get("/", response_model=List[CourseRead])
-def list_courses(section_id: int, db: Session = Depends(get_db)) -> List[CourseRead]:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+async def _require_references(db: AsyncSession, section_id: int, teacher_id: Optional[int]) -> None:
+    section_exists, teacher_exists = await course_service.check_references(db, section_id, teacher_id)
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-    courses = course_service.get_courses_by_section(db, section_id)
-    return courses
+    if not teacher_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
 
 
-@router.post("/", response_model=CourseRead, status_code=status.HTTP_201_CREATED)
-def create_course(section_id: int, course_in: CourseCreate, db: Session = Depends(get_db)) -> CourseRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+@router.get("/", response_model=List[CourseRead])
+async def list_courses(
+    request: Request,
+    section_id: int,
+    validators: Dict[str, str] = Depends(conditional_get(Section, Course)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    courses = await course_service.get_cached_courses_in_section(
+        db, section_id, request.state.table_versions
+    )
+    if courses is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    return json_response(courses, validators)
 
-    teacher = user_service.get_user_by_id(db, course_in.teacher_id)
-    if not teacher:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+
+@router.post("/", response_model=CourseRead, status_code=status.HTTP_201_CREATED)
+async def create_course(
+    section_id: int, course_in: CourseCreate, db: AsyncSession = Depends(get_async_db)
+) -> CourseRead:
+    await _require_references(db, section_id, course_in.teacher_id)
 
     if course_in.section_id is not None and course_in.section_id != section_id:
         raise HTTPException(
@@ -39,22 +52,27 @@ def create_course(section_id: int, course_in: CourseCreate, db: Session = Depend
 
     payload = CourseCreate(**course_in.dict(exclude={"section_id"}, exclude_unset=True), section_id=section_id)
     try:
-        course = course_service.create_course(db, payload)
+        course = await course_service.create_course(db, payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IntegrityError:
+        # The section or teacher can be deleted between the check above and the insert.
+        await db.rollback()
+        await _require_references(db, section_id, course_in.teacher_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to create course due to constraints"
+        )
     return course
 
 
 @router.patch("/{course_id}", response_model=CourseRead)
-def update_course(
-    section_id: int, course_id: int, course_in: CourseUpdate, db: Session = Depends(get_db)
+async def update_course(
+    section_id: int, course_id: int, course_in: CourseUpdate, db: AsyncSession = Depends(get_async_db)
 ) -> CourseRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+    section_exists, course = await course_service.get_course_in_section(db, section_id, course_id)
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-
-    course = course_service.get_course_by_id(db, course_id)
-    if not course or course.section_id != section_id:
+    if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
     if course_in.section_id is not None and course_in.section_id != section_id:
@@ -63,15 +81,15 @@ def update_course(
         )
 
     if course_in.teacher_id is not None:
-        teacher = user_service.get_user_by_id(db, course_in.teacher_id)
-        if not teacher:
+        (teacher_exists,) = await user_service.check_exists(db, course_in.teacher_id)
+        if not teacher_exists:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
 
     payload = CourseUpdate(**course_in.dict(exclude={"section_id"}, exclude_unset=True), section_id=section_id)
     try:
-        course = course_service.update_course(db, course_id, payload)
+        course = await course_service.update_course(db, course_id, payload)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to update course due to constraints"
         )
@@ -82,19 +100,19 @@ def update_course(
 
 
 @router.delete("/{course_id}", response_model=CourseRead, status_code=status.HTTP_200_OK)
-def delete_course(section_id: int, course_id: int, db: Session = Depends(get_db)) -> CourseRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+async def delete_course(
+    section_id: int, course_id: int, db: AsyncSession = Depends(get_async_db)
+) -> CourseRead:
+    section_exists, course = await course_service.get_course_in_section(db, section_id, course_id)
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-
-    course = course_service.get_course_by_id(db, course_id)
-    if not course or course.section_id != section_id:
+    if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
     try:
-        course = course_service.delete_course(db, course_id)
+        course = await course_service.delete_course(db, course_id)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete course because related books exist",
@@ -0,0 +1,39 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.export import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, encode_rows, gzip_chunks
+from app.database.connection import get_async_db
+from app.services import export as export_service
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: Literal["users", "enrollments", "books"],
+    data_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    available = export_service.export_columns(entity)
+    selected = available
+    if columns:
+        selected = list(dict.fromkeys(name.strip() for name in columns.split(",") if name.strip()))
+        unknown = [name for name in selected if name not in available]
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown columns {unknown}; available: {available}",
+            )
+
+    body = encode_rows(data_format, selected, export_service.stream_rows(db, entity, selected))
+    headers = {"Content-Disposition": f'attachment; filename="{entity}.{data_format}"'}
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    media_type = CSV_MEDIA_TYPE if data_format == "csv" else NDJSON_MEDIA_TYPE
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -1,10 +1,13 @@
-from typing import List
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_db
+from app.core.etag import conditional_get
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.grade import Grade
 from app.schemas.grade import GradeCreate, GradeRead, GradeUpdate
 from app.services import grade as grade_service
 
@@ -12,31 +15,39 @@ router = APIRouter(prefix="/grades", tags=["Grades"])
 
 
 @router.get("/", response_model=List[GradeRead])
-def list_grades(db: Session = Depends(get_db)) -> List[GradeRead]:
-    grades = grade_service.get_grades(db)
-    return grades
+async def list_grades(
+    request: Request,
+    validators: Dict[str, str] = Depends(conditional_get(Grade)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    grades = await grade_service.get_cached_grades(db, request.state.table_versions)
+    return json_response(grades, validators)
 
 
 @router.post("/", response_model=GradeRead, status_code=status.HTTP_201_CREATED)
-def create_grade(grade_in: GradeCreate, db: Session = Depends(get_db)) -> GradeRead:
-    grade = grade_service.create_grade(db, grade_in)
+async def create_grade(grade_in: GradeCreate, db: AsyncSession = Depends(get_async_db)) -> GradeRead:
+    grade = await grade_service.create_grade(db, grade_in)
     return grade
 
 
-@router.get("/{grade_id}", response_model=GradeRead)
-def get_grade(grade_id: int, db: Session = Depends(get_db)) -> GradeRead:
-    grade = grade_service.get_grade_by_id(db, grade_id)
+@router.get(
+    "/{grade_id}", response_model=GradeRead, dependencies=[Depends(conditional_get(Grade))]
+)
+async def get_grade(request: Request, grade_id: int, db: AsyncSession = Depends(get_async_db)) -> GradeRead:
+    grade = await grade_service.get_cached_grade(db, grade_id, request.state.table_versions)
     if not grade:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
     return grade
 
 
 @router.patch("/{grade_id}", response_model=GradeRead)
-def update_grade(grade_id: int, grade_in: GradeUpdate, db: Session = Depends(get_db)) -> GradeRead:
+async def update_grade(
+    grade_id: int, grade_in: GradeUpdate, db: AsyncSession = Depends(get_async_db)
+) -> GradeRead:
     try:
-        grade = grade_service.update_grade(db, grade_id, grade_in)
+        grade = await grade_service.update_grade(db, grade_id, grade_in)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Grade update violated constraints"
         )
@@ -47,11 +58,11 @@ def update_grade(grade_id: int, grade_in: GradeUpdate, db: Session = Depends(get
 
 
 @router.delete("/{grade_id}", response_model=GradeRead, status_code=status.HTTP_200_OK)
-def delete_grade(grade_id: int, db: Session = Depends(get_db)) -> GradeRead:
+async def delete_grade(grade_id: int, db: AsyncSession = Depends(get_async_db)) -> GradeRead:
     try:
-        grade = grade_service.delete_grade(db, grade_id)
+        grade = await grade_service.delete_grade(db, grade_id)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete grade because related records still exist",
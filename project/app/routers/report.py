@@ -0,0 +1,51 @@
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import conditional_get
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.course import Course
+from app.models.section import Section
+from app.models.user import User
+from app.schemas.report import TeacherReportPage, TeachingSummary
+from app.services import report as report_service
+
+router = APIRouter(tags=["Reports"])
+
+report_validators = conditional_get(User, Course, Section)
+
+
+@router.get("/users/{user_id}/teaching-summary", response_model=TeachingSummary)
+async def get_teaching_summary(
+    user_id: int,
+    validators: Dict[str, str] = Depends(report_validators),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    summary = await report_service.get_teaching_summary(db, user_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+    return json_response(summary, validators)
+
+
+@router.get("/reports/teachers", response_model=TeacherReportPage)
+async def list_teacher_reports(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    validators: Dict[str, str] = Depends(report_validators),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    # Fetch one extra row to know whether another page exists without a COUNT.
+    teachers = await report_service.get_teacher_reports(db, limit=limit + 1, after_id=after_id)
+    next_cursor = None
+    if len(teachers) > limit:
+        teachers = teachers[:limit]
+        next_cursor = encode_cursor(teachers[-1]["teacher_id"])
+    return json_response({"items": teachers, "next_cursor": next_cursor}, validators)
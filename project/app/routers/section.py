@@ -1,10 +1,14 @@
-from typing import List
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_db
+from app.core.etag import conditional_get
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.grade import Grade
+from app.models.section import Section
 from app.schemas.section import SectionCreate, SectionRead, SectionUpdate
 from app.services import grade as grade_service
 from app.services import section as section_service
@@ -12,20 +16,30 @@ from app.services import section as section_service
 router = APIRouter(prefix="/grades/{grade_id}/sections", tags=["Sections"])
 
 
-@router.get("/", response_model=List[SectionRead])
-def list_sections(grade_id: int, db: Session = Depends(get_db)) -> List[SectionRead]:
-    grade = grade_service.get_grade_by_id(db, grade_id)
+async def _require_grade(db: AsyncSession, grade_id: int) -> None:
+    grade = await grade_service.get_grade_by_id(db, grade_id)
     if not grade:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
-    sections = section_service.get_sections_by_grade(db, grade_id)
-    return sections
 
 
-@router.post("/", response_model=SectionRead, status_code=status.HTTP_201_CREATED)
-def create_section(grade_id: int, section_in: SectionCreate, db: Session = Depends(get_db)) -> SectionRead:
-    grade = grade_service.get_grade_by_id(db, grade_id)
-    if not grade:
+@router.get("/", response_model=List[SectionRead])
+async def list_sections(
+    request: Request,
+    grade_id: int,
+    validators: Dict[str, str] = Depends(conditional_get(Grade, Section)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    sections = await section_service.get_cached_sections_in_grade(db, grade_id, request.state.table_versions)
+    if sections is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
+    return json_response(sections, validators)
+
+
+@router.post("/", response_model=SectionRead, status_code=status.HTTP_201_CREATED)
+async def create_section(
+    grade_id: int, section_in: SectionCreate, db: AsyncSession = Depends(get_async_db)
+) -> SectionRead:
+    await _require_grade(db, grade_id)
 
     if section_in.grade_id is not None and section_in.grade_id != grade_id:
         raise HTTPException(
@@ -34,22 +48,27 @@ def create_section(grade_id: int, section_in: SectionCreate, db: Session = Depen
 
     payload = SectionCreate(**section_in.dict(exclude={"grade_id"}, exclude_unset=True), grade_id=grade_id)
     try:
-        section = section_service.create_section(db, payload)
+        section = await section_service.create_section(db, payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IntegrityError:
+        # The grade can be deleted between the check above and the insert.
+        await db.rollback()
+        await _require_grade(db, grade_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to create section due to constraints"
+        )
     return section
 
 
 @router.patch("/{section_id}", response_model=SectionRead)
-def update_section(
-    grade_id: int, section_id: int, section_in: SectionUpdate, db: Session = Depends(get_db)
+async def update_section(
+    grade_id: int, section_id: int, section_in: SectionUpdate, db: AsyncSession = Depends(get_async_db)
 ) -> SectionRead:
-    grade = grade_service.get_grade_by_id(db, grade_id)
-    if not grade:
+    grade_exists, section = await section_service.get_section_in_grade(db, grade_id, section_id)
+    if not grade_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
-
-    section = section_service.get_section_by_id(db, section_id)
-    if not section or section.grade_id != grade_id:
+    if not section:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
 
     if section_in.grade_id is not None and section_in.grade_id != grade_id:
@@ -59,9 +78,9 @@ def update_section(
 
     payload = SectionUpdate(**section_in.dict(exclude={"grade_id"}, exclude_unset=True), grade_id=grade_id)
     try:
-        section = section_service.update_section(db, section_id, payload)
+        section = await section_service.update_section(db, section_id, payload)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to update section due to constraints"
         )
@@ -72,19 +91,19 @@ def update_section(
 
 
 @router.delete("/{section_id}", response_model=SectionRead, status_code=status.HTTP_200_OK)
-def delete_section(grade_id: int, section_id: int, db: Session = Depends(get_db)) -> SectionRead:
-    grade = grade_service.get_grade_by_id(db, grade_id)
-    if not grade:
+async def delete_section(
+    grade_id: int, section_id: int, db: AsyncSession = Depends(get_async_db)
+) -> SectionRead:
+    grade_exists, section = await section_service.get_section_in_grade(db, grade_id, section_id)
+    if not grade_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grade not found")
-
-    section = section_service.get_section_by_id(db, section_id)
-    if not section or section.grade_id != grade_id:
+    if not section:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
 
     try:
-        section = section_service.delete_section(db, section_id)
+        section = await section_service.delete_section(db, section_id)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete section because related courses or enrollments exist",
@@ -1,61 +1,135 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.database.connection import get_db
-from app.schemas.student_section import StudentSectionCreate, StudentSectionRead, StudentSectionUpdate
-from app.schemas.user import UserRead
-from app.services import section as section_service
+from typing import Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import conditional_get
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+from app.schemas.student_section import (
+    RosterPage,
+    StudentSectionBulkCreate,
+    StudentSectionBulkResult,
+    StudentSectionCreate,
+    StudentSectionRead,
+    StudentSectionUpdate,
+)
 from app.services import student_section as enrollment_service
 from app.services import user as user_service
 
 router = APIRouter(prefix="/sections/{section_id}", tags=["StudentSection"])
 
 
-@router.post("/enroll", response_model=StudentSectionRead, status_code=status.HTTP_201_CREATED)
-def enroll_student(
-    section_id: int, enrollment_in: StudentSectionCreate, db: Session = Depends(get_db)
-) -> StudentSectionRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+async def _require_references(db: AsyncSession, section_id: int, student_id: Optional[int]) -> None:
+    section_exists, student_exists = await enrollment_service.check_references(db, section_id, student_id)
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-
-    student = user_service.get_user_by_id(db, enrollment_in.student_id)
-    if not student:
+    if not student_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
+
+@router.post("/enroll", response_model=StudentSectionRead, status_code=status.HTTP_201_CREATED)
+async def enroll_student(
+    section_id: int, enrollment_in: StudentSectionCreate, db: AsyncSession = Depends(get_async_db)
+) -> StudentSectionRead:
+    await _require_references(db, section_id, enrollment_in.student_id)
+
     try:
-        enrollment = enrollment_service.enroll_student(db, section_id, enrollment_in)
+        enrollment = await enrollment_service.enroll_student(db, section_id, enrollment_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IntegrityError:
+        # Lost a race with a delete of the section or student, or with the same enrollment.
+        await db.rollback()
+        await _require_references(db, section_id, enrollment_in.student_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Student already enrolled in this section"
+        )
     return enrollment
 
 
-@router.get("/students", response_model=List[UserRead])
-def list_students(section_id: int, db: Session = Depends(get_db)) -> List[UserRead]:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+@router.post("/enroll/bulk", response_model=StudentSectionBulkResult)
+async def enroll_students(
+    section_id: int, enrollment_in: StudentSectionBulkCreate, db: AsyncSession = Depends(get_async_db)
+) -> StudentSectionBulkResult:
+    await _require_references(db, section_id, None)
+
+    try:
+        return await enrollment_service.enroll_students(db, section_id, enrollment_in.student_ids)
+    except IntegrityError:
+        # The section, or one of the students, was deleted after the checks.
+        await db.rollback()
+        await _require_references(db, section_id, None)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to enroll students due to constraints"
+        )
+
+
+# Cursor values per sort order, matching the keyset columns in get_roster.
+ROSTER_CURSORS = {"id": (int,), "name": (str, int)}
+
+
+@router.get("/students", response_model=RosterPage)
+async def list_students(
+    section_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: Literal["id", "name"] = "id",
+    validators: Dict[str, str] = Depends(conditional_get(Section, StudentSection, User)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    try:
+        after = decode_keyset_cursor(cursor, ROSTER_CURSORS[sort]) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    # Fetch one extra row to know whether another page exists without a COUNT.
+    roster = await enrollment_service.get_roster(db, section_id, limit=limit + 1, sort=sort, after=after)
+    if roster is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-    students = enrollment_service.get_students_in_section(db, section_id)
-    return students
+    next_cursor = None
+    if len(roster) > limit:
+        roster = roster[:limit]
+        last = roster[-1]
+        keys = (last["full_name"], last["student_id"]) if sort == "name" else (last["student_id"],)
+        next_cursor = encode_keyset_cursor(keys)
+    return json_response({"items": roster, "next_cursor": next_cursor}, validators)
 
 
 @router.patch("/enroll/{enrollment_id}", response_model=StudentSectionRead)
-def update_enrollment(
-    section_id: int, enrollment_id: int, enrollment_in: StudentSectionUpdate, db: Session = Depends(get_db)
+async def update_enrollment(
+    section_id: int,
+    enrollment_id: int,
+    enrollment_in: StudentSectionUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ) -> StudentSectionRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+    section_exists, enrollment = await enrollment_service.get_enrollment_in_section(
+        db, section_id, enrollment_id
+    )
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if not enrollment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
 
     if enrollment_in.student_id is not None:
-        student = user_service.get_user_by_id(db, enrollment_in.student_id)
-        if not student:
+        (student_exists,) = await user_service.check_exists(db, enrollment_in.student_id)
+        if not student_exists:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
     try:
-        enrollment = enrollment_service.update_enrollment(db, section_id, enrollment_id, enrollment_in)
+        enrollment = await enrollment_service.update_enrollment(
+            db, section_id, enrollment_id, enrollment_in
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -65,12 +139,18 @@ def update_enrollment(
 
 
 @router.delete("/enroll/{enrollment_id}", response_model=StudentSectionRead, status_code=status.HTTP_200_OK)
-def delete_enrollment(section_id: int, enrollment_id: int, db: Session = Depends(get_db)) -> StudentSectionRead:
-    section = section_service.get_section_by_id(db, section_id)
-    if not section:
+async def delete_enrollment(
+    section_id: int, enrollment_id: int, db: AsyncSession = Depends(get_async_db)
+) -> StudentSectionRead:
+    section_exists, enrollment = await enrollment_service.get_enrollment_in_section(
+        db, section_id, enrollment_id
+    )
+    if not section_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if not enrollment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
 
-    enrollment = enrollment_service.delete_enrollment(db, section_id, enrollment_id)
+    enrollment = await enrollment_service.delete_enrollment(db, section_id, enrollment_id)
     if not enrollment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found")
     return enrollment
@@ -1,42 +1,67 @@
-from typing import List
+from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_db
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.core.etag import conditional_get
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.responses import json_response
+from app.database.connection import get_async_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserPage, UserRead, UserUpdate
 from app.services import user as user_service
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("/", response_model=List[UserRead])
-def list_users(db: Session = Depends(get_db)) -> List[UserRead]:
-    users = user_service.get_users(db)
-    return users
+@router.get("/", response_model=UserPage)
+async def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    role: Optional[str] = None,
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=255),
+    validators: Dict[str, str] = Depends(conditional_get(User)),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    # Fetch one extra row to know whether another page exists without a COUNT.
+    users = await user_service.get_users(
+        db, limit=limit + 1, after_id=after_id, role=role, name_prefix=name_prefix
+    )
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1]["id"])
+    return json_response({"items": users, "next_cursor": next_cursor}, validators)
 
 
-@router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)) -> UserRead:
-    user = user_service.get_user_by_id(db, user_id)
+@router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(conditional_get(User))])
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)) -> UserRead:
+    user = await user_service.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> UserRead:
+async def create_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)) -> UserRead:
     try:
-        user = user_service.create_user(db, user_in)
+        user = await user_service.create_user(db, user_in)
         return user
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.patch("/{user_id}", response_model=UserRead)
-def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db)) -> UserRead:
+async def update_user(
+    user_id: int, user_in: UserUpdate, db: AsyncSession = Depends(get_async_db)
+) -> UserRead:
     try:
-        user = user_service.update_user(db, user_id, user_in)
+        user = await user_service.update_user(db, user_id, user_in)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     if not user:
@@ -45,9 +70,9 @@ def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db)
 
 
 @router.delete("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
-def delete_user(user_id: int, db: Session = Depends(get_db)) -> UserRead:
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)) -> UserRead:
     try:
-        user = user_service.delete_user(db, user_id)
+        user = await user_service.delete_user(db, user_id)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     if not user:
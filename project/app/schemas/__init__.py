@@ -1,15 +1,40 @@
-from app.schemas.auth import LoginRequest, LoginResponse
-from app.schemas.book import BookCreate, BookRead, BookUpdate
+from app.schemas.auth import LoginRequest, LoginResponse, RefreshRequest, TokenClaims, TokenPair
+from app.schemas.book import (
+    BookCreate,
+    BookImportError,
+    BookImportResult,
+    BookRead,
+    BookSearchPage,
+    BookUpdate,
+)
+from app.schemas.catalog import (
+    BookSummary,
+    CourseTree,
+    GradeTree,
+    LibraryCourse,
+    LibrarySection,
+    SectionTree,
+    StudentLibrary,
+)
 from app.schemas.course import CourseCreate, CourseRead, CourseUpdate
 from app.schemas.grade import GradeCreate, GradeRead, GradeUpdate
+from app.schemas.report import TeacherReport, TeacherReportPage, TeachingCourse, TeachingSummary
 from app.schemas.section import SectionCreate, SectionRead, SectionUpdate
-from app.schemas.student_section import StudentSectionCreate, StudentSectionRead
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.student_section import (
+    RosterEntry,
+    RosterPage,
+    StudentSectionBulkCreate,
+    StudentSectionBulkResult,
+    StudentSectionCreate,
+    StudentSectionRead,
+)
+from app.schemas.user import UserCreate, UserPage, UserRead, UserUpdate
 
 __all__ = [
     "UserCreate",
     "UserRead",
     "UserUpdate",
+    "UserPage",
     "GradeCreate",
     "GradeRead",
     "GradeUpdate",
@@ -22,8 +47,29 @@ __all__ = [
     "BookCreate",
     "BookRead",
     "BookUpdate",
+    "BookImportError",
+    "BookImportResult",
+    "BookSearchPage",
+    "GradeTree",
+    "SectionTree",
+    "CourseTree",
+    "BookSummary",
+    "StudentLibrary",
+    "LibrarySection",
+    "LibraryCourse",
+    "TeachingCourse",
+    "TeachingSummary",
+    "TeacherReport",
+    "TeacherReportPage",
     "StudentSectionCreate",
     "StudentSectionRead",
+    "StudentSectionBulkCreate",
+    "StudentSectionBulkResult",
+    "RosterEntry",
+    "RosterPage",
     "LoginRequest",
     "LoginResponse",
+    "RefreshRequest",
+    "TokenClaims",
+    "TokenPair",
 ]
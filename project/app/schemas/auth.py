@@ -8,7 +8,24 @@ class LoginRequest(BaseModel):
     password: str
 
 
-class LoginResponse(BaseModel):
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class TokenClaims(BaseModel):
+    sub: int
+    role: str
+    exp: int
+
+
+class LoginResponse(TokenPair):
     message: str
     user: UserRead
 
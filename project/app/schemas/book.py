@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -34,3 +34,20 @@ class BookRead(BookBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BookImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class BookImportResult(BaseModel):
+    created: int
+    book_ids: List[int]
+    errors: List[BookImportError]
+
+
+class BookSearchPage(BaseModel):
+    items: List[BookRead]
+    mode: Literal["fulltext", "fuzzy"]
+    next_offset: Optional[int] = None
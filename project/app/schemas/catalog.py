@@ -0,0 +1,58 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BookSummary(BaseModel):
+    id: int
+    title: str
+    author: str
+    category: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CourseTree(BaseModel):
+    id: int
+    name: str
+    teacher_id: int
+    books: List[BookSummary]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SectionTree(BaseModel):
+    id: int
+    name: str
+    courses: List[CourseTree]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GradeTree(BaseModel):
+    id: int
+    name: str
+    sections: List[SectionTree]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LibrarySection(BaseModel):
+    id: int
+    name: str
+    grade_id: int
+
+
+class LibraryCourse(BaseModel):
+    id: int
+    name: str
+    section_id: int
+    teacher_id: int
+    books: List[BookSummary]
+
+
+class StudentLibrary(BaseModel):
+    student_id: int
+    sections: List[LibrarySection]
+    courses: List[LibraryCourse]
+    next_cursor: Optional[str] = None
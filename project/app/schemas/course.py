@@ -19,5 +19,6 @@ class CourseUpdate(BaseModel):
 class CourseRead(CourseBase):
     id: int
     section_id: int
+    book_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
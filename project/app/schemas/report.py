@@ -0,0 +1,37 @@
+from typing import List
+
+from pydantic import BaseModel, EmailStr
+
+
+class TeachingCourse(BaseModel):
+    id: int
+    name: str
+    section_id: int
+    section_name: str
+    grade_id: int
+    book_count: int
+    student_count: int
+
+
+class TeachingSummary(BaseModel):
+    teacher_id: int
+    full_name: str
+    course_count: int
+    book_count: int
+    # Seats: a student in two of the teacher's courses is counted twice.
+    student_count: int
+    courses: List[TeachingCourse]
+
+
+class TeacherReport(BaseModel):
+    teacher_id: int
+    full_name: str
+    email: EmailStr
+    course_count: int
+    book_count: int
+    student_count: int
+
+
+class TeacherReportPage(BaseModel):
+    items: List[TeacherReport]
+    next_cursor: str | None = None
@@ -17,5 +17,6 @@ class SectionUpdate(BaseModel):
 class SectionRead(SectionBase):
     id: int
     grade_id: int
+    student_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
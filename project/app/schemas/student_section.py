@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class StudentSectionCreate(BaseModel):
@@ -15,3 +17,25 @@ class StudentSectionRead(BaseModel):
     section_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RosterEntry(BaseModel):
+    enrollment_id: int
+    student_id: int
+    full_name: str
+    email: EmailStr
+
+
+class RosterPage(BaseModel):
+    items: List[RosterEntry]
+    next_cursor: str | None = None
+
+
+class StudentSectionBulkCreate(BaseModel):
+    student_ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class StudentSectionBulkResult(BaseModel):
+    inserted: List[int]
+    skipped: List[int]
+    missing: List[int]
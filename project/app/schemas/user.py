@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import List
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -24,3 +26,8 @@ class UserRead(UserBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserPage(BaseModel):
+    items: List[UserRead]
+    next_cursor: str | None = None
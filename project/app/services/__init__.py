@@ -1,3 +1,25 @@
-from app.services import auth, book, course, grade, section, student_section, user
+from app.services import (
+    auth,
+    book,
+    catalog,
+    course,
+    export,
+    grade,
+    report,
+    section,
+    student_section,
+    user,
+)
 
-__all__ = ["auth", "user", "grade", "section", "course", "book", "student_section"]
+__all__ = [
+    "auth",
+    "user",
+    "grade",
+    "section",
+    "course",
+    "book",
+    "catalog",
+    "export",
+    "report",
+    "student_section",
+]
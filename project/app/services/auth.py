@@ -1,16 +1,58 @@
-from typing import Optional
+import logging
+from typing import Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import verify_password
-from app.models.user import User
+from app.core.config import settings
+from app.core.security import verify_and_update_async
+from app.core.tokens import ACCESS_TOKEN, REFRESH_TOKEN, create_token, decode_token
+from app.database.connection import AsyncSessionLocal
+from app.schemas.auth import TokenPair
 from app.services import user as user_service
 
+logger = logging.getLogger(__name__)
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = user_service.get_user_by_email(db, email)
-    if not user:
-        return None
-    if not verify_password(password, user.password_hash):
+
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Tuple[Optional[Row], Optional[str]]:
+    """Return the credential row and, when the stored hash is outdated, its replacement."""
+    credentials = await user_service.get_credentials_by_email(db, email)
+    if not credentials:
+        return None, None
+    # End the read transaction so the pooled connection is not held while bcrypt runs.
+    await db.commit()
+    valid, new_hash = await verify_and_update_async(password, credentials.password_hash)
+    if not valid:
+        return None, None
+    return credentials, new_hash
+
+
+async def rehash_password(user_id: int, current_hash: str, new_hash: str) -> None:
+    # Runs after the login response is sent, on its own session.
+    try:
+        async with AsyncSessionLocal() as db:
+            await user_service.replace_password_hash(db, user_id, current_hash, new_hash)
+    except SQLAlchemyError:
+        logger.exception("Could not store the rehashed password of user %s", user_id)
+
+
+def issue_tokens(user_id: int, role: str) -> TokenPair:
+    return TokenPair(
+        access_token=create_token(user_id, role, ACCESS_TOKEN),
+        refresh_token=create_token(user_id, role, REFRESH_TOKEN),
+        expires_in=settings.access_token_ttl,
+    )
+
+
+async def refresh_tokens(db: AsyncSession, refresh_token: str) -> Optional[TokenPair]:
+    claims = decode_token(refresh_token, REFRESH_TOKEN)
+    user_id = int(claims["sub"])
+    # Refresh is the one place that re-reads the user, so deleted users and role
+    # changes take effect within one access-token lifetime.
+    role = await user_service.get_role(db, user_id)
+    if role is None:
         return None
-    return user
+    return issue_tokens(user_id, role)
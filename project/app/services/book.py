@@ -1,49 +1,209 @@
-from typing import List, Optional
-
-from sqlalchemy.orm import Session
-
-from app.models.book import Book
-from app.schemas.book import BookCreate, BookUpdate
-
-
-def create_book(db: Session, book_in: BookCreate) -> Book:
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ingest import Record
+from app.models.book import SEARCH_CONFIG, Book
+from app.models.course import Course
+from app.models.section import Section
+from app.models.user import User
+from app.schemas.book import BookCreate, BookImportError, BookImportResult, BookRead, BookUpdate
+from app.services.common import (
+    apply_counters,
+    bump_versions,
+    delete_instance,
+    exist,
+    get_scoped,
+    insert_returning,
+    list_scoped_rows,
+    read_columns,
+    update_returning,
+)
+
+IMPORT_BATCH_SIZE = 500
+
+
+async def create_book(db: AsyncSession, book_in: BookCreate) -> Book:
     if book_in.course_id is None:
         raise ValueError("course_id is required to create a book")
 
-    book = Book(**book_in.dict())
-    db.add(book)
-    db.commit()
-    db.refresh(book)
-    return book
-
-
-def get_books_by_course(db: Session, course_id: int) -> List[Book]:
-    return db.query(Book).filter(Book.course_id == course_id).order_by(Book.id).all()
-
-
-def get_book_by_id(db: Session, book_id: int) -> Optional[Book]:
-    return db.get(Book, book_id)
-
-
-def update_book(db: Session, book_id: int, book_in: BookUpdate) -> Optional[Book]:
-    book = get_book_by_id(db, book_id)
-    if not book:
-        return None
-
-    for field, value in book_in.dict(exclude_unset=True).items():
-        setattr(book, field, value)
-
-    db.add(book)
-    db.commit()
-    db.refresh(book)
-    return book
-
-
-def delete_book(db: Session, book_id: int) -> Optional[Book]:
-    book = get_book_by_id(db, book_id)
+    return await insert_returning(
+        db, Book, book_in.dict(), counters=[(Course.book_count, book_in.course_id, 1)]
+    )
+
+
+async def get_books_in_course(db: AsyncSession, course_id: int) -> Optional[List[dict]]:
+    return await list_scoped_rows(
+        db, Course, course_id, Book, Book.course_id, read_columns(Book, BookRead)
+    )
+
+
+async def get_book_in_course(
+    db: AsyncSession, course_id: int, book_id: int
+) -> Tuple[bool, Optional[Book]]:
+    return await get_scoped(db, Course, course_id, Book, Book.course_id, book_id)
+
+
+async def check_references(
+    db: AsyncSession, course_id: int, created_by: Optional[int]
+) -> Tuple[bool, bool]:
+    if created_by is None:
+        (course_exists,) = await exist(db, Course.id == course_id)
+        return course_exists, True
+    course_exists, creator_exists = await exist(db, Course.id == course_id, User.id == created_by)
+    return course_exists, creator_exists
+
+
+async def search_books(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    offset: int = 0,
+    course_id: Optional[int] = None,
+    grade_id: Optional[int] = None,
+) -> Tuple[List[Book], str]:
+    filters = []
+    if course_id is not None:
+        filters.append(Book.course_id == course_id)
+    if grade_id is not None:
+        filters.append(
+            Book.course_id.in_(
+                select(Course.id)
+                .join(Section, Section.id == Course.section_id)
+                .where(Section.grade_id == grade_id)
+            )
+        )
+
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    result = await db.scalars(
+        select(Book)
+        .where(Book.search_vector.bool_op("@@")(tsquery), *filters)
+        .order_by(func.ts_rank_cd(Book.search_vector, tsquery).desc(), Book.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    books = list(result)
+    if books or offset:
+        return books, "fulltext"
+
+    # Nothing matched the stemmed terms; fall back to typo-tolerant author matching,
+    # which the trigram index on books.author serves through the % operator.
+    result = await db.scalars(
+        select(Book)
+        .where(Book.author.bool_op("%")(q), *filters)
+        .order_by(func.similarity(Book.author, q).desc(), Book.id)
+        .limit(limit)
+    )
+    return list(result), "fuzzy"
+
+
+async def get_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
+    return await db.get(Book, book_id)
+
+
+async def update_book(db: AsyncSession, book_id: int, book_in: BookUpdate) -> Optional[Book]:
+    update_data = book_in.dict(exclude_unset=True)
+    counters = []
+    new_course_id = update_data.get("course_id")
+    if new_course_id is not None:
+        book = await get_book_by_id(db, book_id)
+        if book and book.course_id != new_course_id:
+            counters = [(Course.book_count, book.course_id, -1), (Course.book_count, new_course_id, 1)]
+    return await update_returning(db, Book, book_id, update_data, counters=counters)
+
+
+async def delete_book(db: AsyncSession, book_id: int) -> Optional[Book]:
+    book = await get_book_by_id(db, book_id)
     if not book:
         return None
 
-    db.delete(book)
-    db.commit()
-    return book
+    return await delete_instance(db, book, counters=[(Course.book_count, book.course_id, -1)])
+
+
+async def _insert_book_rows(
+    db: AsyncSession, rows: List[Tuple[int, dict]], result: BookImportResult
+) -> None:
+    try:
+        async with db.begin_nested():
+            book_ids = await db.scalars(
+                insert(Book).returning(Book.id, sort_by_parameter_order=True), [values for _, values in rows]
+            )
+            result.book_ids.extend(book_ids)
+        return
+    except DBAPIError:
+        pass
+
+    # Some row in the chunk was rejected by the database; retry one by one so only
+    # the offending rows are reported.
+    for line, values in rows:
+        try:
+            async with db.begin_nested():
+                book_id = await db.scalar(insert(Book).values(**values).returning(Book.id))
+            result.book_ids.append(book_id)
+        except DBAPIError as exc:
+            detail = str(exc.orig).splitlines()[0] if exc.orig else "Database error"
+            result.errors.append(BookImportError(line=line, detail=detail))
+
+
+async def _flush_book_rows(
+    db: AsyncSession, rows: List[Tuple[int, dict]], known_user_ids: Set[int], result: BookImportResult
+) -> None:
+    unknown = {values["created_by"] for _, values in rows} - known_user_ids
+    if unknown:
+        found = await db.scalars(select(User.id).where(User.id.in_(unknown)))
+        known_user_ids.update(found)
+
+    valid_rows = []
+    for line, values in rows:
+        if values["created_by"] in known_user_ids:
+            valid_rows.append((line, values))
+        else:
+            result.errors.append(BookImportError(line=line, detail="User not found"))
+
+    if valid_rows:
+        await _insert_book_rows(db, valid_rows, result)
+
+
+async def import_books(
+    db: AsyncSession, course_id: int, records: AsyncIterator[Record], batch_size: int = IMPORT_BATCH_SIZE
+) -> BookImportResult:
+    result = BookImportResult(created=0, book_ids=[], errors=[])
+    known_user_ids: Set[int] = set()
+    batch: List[Tuple[int, dict]] = []
+
+    async for line, record, error in records:
+        if error:
+            result.errors.append(BookImportError(line=line, detail=error))
+            continue
+        if record.get("course_id") not in (None, course_id, str(course_id)):
+            result.errors.append(
+                BookImportError(line=line, detail="course_id mismatch with path parameter")
+            )
+            continue
+        try:
+            book_in = BookCreate(**{**record, "course_id": course_id})
+        except ValidationError as exc:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+            )
+            result.errors.append(BookImportError(line=line, detail=detail))
+            continue
+
+        batch.append((line, book_in.dict()))
+        if len(batch) >= batch_size:
+            await _flush_book_rows(db, batch, known_user_ids, result)
+            batch = []
+
+    if batch:
+        await _flush_book_rows(db, batch, known_user_ids, result)
+
+    if result.book_ids:
+        tables = await apply_counters(db, [(Course.book_count, course_id, len(result.book_ids))])
+        await bump_versions(db, Book.__tablename__, *tables)
+    await db.commit()
+    result.created = len(result.book_ids)
+    result.errors.sort(key=lambda err: err.line)
+    return result
@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+
+from app.core.cache import invalidate
+from app.models.book import Book
+from app.models.course import Course
+from app.models.grade import Grade
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+from app.schemas.catalog import LibraryCourse, LibrarySection
+from app.services.common import cached_at_versions
+
+# Tables a cached library is stamped with; the library route's ETag covers the same ones.
+LIBRARY_TABLES = tuple(
+    model.__tablename__ for model in (User, StudentSection, Section, Course, Book)
+)
+
+# One SELECT per level regardless of how many nodes the tree has.
+_tree_loader = (
+    selectinload(Grade.sections)
+    .selectinload(Section.courses)
+    .selectinload(Course.books)
+    .load_only(Book.id, Book.title, Book.author, Book.category, Book.course_id)
+)
+
+# student → enrollments → sections → courses → books, one SELECT per level.
+_library_loader = (
+    selectinload(User.student_sections)
+    .selectinload(StudentSection.section)
+    .options(
+        load_only(Section.id, Section.name, Section.grade_id),
+        selectinload(Section.courses)
+        .selectinload(Course.books)
+        .load_only(Book.id, Book.title, Book.author, Book.category, Book.course_id),
+    )
+)
+
+
+async def get_grade_tree(db: AsyncSession, grade_id: int) -> Optional[Grade]:
+    return await db.scalar(select(Grade).where(Grade.id == grade_id).options(_tree_loader))
+
+
+async def get_catalog_tree(db: AsyncSession) -> List[Grade]:
+    result = await db.scalars(select(Grade).order_by(Grade.id).options(_tree_loader))
+    return list(result)
+
+
+async def get_library(db: AsyncSession, user_id: int) -> Optional[dict]:
+    user = await db.scalar(
+        select(User).where(User.id == user_id).options(load_only(User.id), _library_loader)
+    )
+    if user is None:
+        return None
+    sections = sorted((enrollment.section for enrollment in user.student_sections), key=lambda s: s.id)
+    courses = sorted((course for section in sections for course in section.courses), key=lambda c: c.id)
+    return {
+        "sections": [
+            LibrarySection.model_validate(section, from_attributes=True).model_dump() for section in sections
+        ],
+        "courses": [
+            LibraryCourse.model_validate(course, from_attributes=True).model_dump() for course in courses
+        ],
+    }
+
+
+async def get_cached_library(
+    db: AsyncSession, user_id: int, known_versions: Optional[Dict[str, int]] = None
+) -> Optional[dict]:
+    """The student's whole library, cached per student.
+
+    Enrollment writes invalidate the entry directly; writes made by other workers
+    are caught by the table versions stored with it.
+    """
+    return await cached_at_versions(
+        db, "library", user_id, LIBRARY_TABLES, lambda: get_library(db, user_id), known_versions
+    )
+
+
+async def invalidate_libraries(*student_ids: int) -> None:
+    await invalidate(*(("library", student_id) for student_id in student_ids))
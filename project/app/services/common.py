@@ -0,0 +1,164 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from app.core.cache import cached, invalidate
+from app.models.table_version import TableVersion
+
+
+async def get_scoped(
+    db: AsyncSession, parent: Any, parent_id: int, child: Any, parent_key: Any, child_id: int
+) -> Tuple[bool, Optional[Any]]:
+    # Parent LEFT JOIN child in one round trip: no row means the parent is missing,
+    # a row without a child means the child is missing or belongs to another parent.
+    row = (
+        await db.execute(
+            select(parent.id, child)
+            .select_from(parent)
+            .outerjoin(child, and_(parent_key == parent.id, child.id == child_id))
+            .where(parent.id == parent_id)
+        )
+    ).first()
+    if row is None:
+        return False, None
+    return True, row[1]
+
+
+def read_columns(model: Any, schema: Any) -> List[Any]:
+    # Only the columns the response schema exposes, in its field order.
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+async def list_scoped_rows(
+    db: AsyncSession, parent: Any, parent_id: int, child: Any, parent_key: Any, columns: List[Any]
+) -> Optional[List[Dict[str, Any]]]:
+    # Plain column rows skip identity-map bookkeeping and attribute instrumentation;
+    # routers serialize the dicts straight to JSON.
+    names = [column.key for column in columns]
+    rows = (
+        await db.execute(
+            select(parent.id, child.id, *columns)
+            .select_from(parent)
+            .outerjoin(child, parent_key == parent.id)
+            .where(parent.id == parent_id)
+            .order_by(child.id)
+        )
+    ).all()
+    if not rows:
+        return None
+    return [dict(zip(names, row[2:])) for row in rows if row[1] is not None]
+
+
+async def exist(db: AsyncSession, *conditions: ColumnElement) -> Tuple[bool, ...]:
+    row = (await db.execute(select(*(exists().where(condition) for condition in conditions)))).one()
+    return tuple(row)
+
+
+async def bump_versions(db: AsyncSession, *tables: str) -> None:
+    # Runs right before commit so the row locks on table_versions are held briefly.
+    await db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(sorted(tables)))
+        .values(version=TableVersion.version + 1)
+    )
+
+
+async def get_versions(db: AsyncSession, *tables: str) -> Tuple[int, ...]:
+    rows = dict(
+        (
+            await db.execute(
+                select(TableVersion.table_name, TableVersion.version).where(
+                    TableVersion.table_name.in_(tables)
+                )
+            )
+        ).all()
+    )
+    return tuple(rows.get(table, 0) for table in tables)
+
+
+async def cached_at_versions(
+    db: AsyncSession,
+    entity: str,
+    key: Any,
+    tables: Sequence[str],
+    loader: Callable[[], Awaitable[Any]],
+    known_versions: Optional[Dict[str, int]] = None,
+) -> Any:
+    """``cached`` for entries that must follow writes made by other workers.
+
+    Each entry stores the table versions read before it was loaded; an entry whose
+    versions differ from the current ones is reloaded. ``known_versions`` reuses
+    counters the request already read (see ``conditional_get``).
+    """
+    if known_versions is not None and all(table in known_versions for table in tables):
+        versions = [known_versions[table] for table in tables]
+    else:
+        versions = list(await get_versions(db, *tables))
+
+    async def load() -> Any:
+        value = await loader()
+        return None if value is None else {"versions": versions, "value": value}
+
+    entry = await cached(entity, key, load)
+    if entry is not None and entry["versions"] != versions:
+        await invalidate((entity, key))
+        entry = await cached(entity, key, load)
+    return None if entry is None else entry["value"]
+
+
+# A counter column, the id of the row holding it and the amount to add.
+CounterDelta = Tuple[Any, Optional[int], int]
+
+
+async def apply_counters(db: AsyncSession, counters: Sequence[CounterDelta]) -> List[str]:
+    # Relative updates (count = count + n) stay correct under concurrent writers;
+    # a fixed order keeps two transactions from locking the same rows crosswise.
+    tables = []
+    for column, row_id, delta in sorted(counters, key=lambda counter: (counter[0].key, counter[1] or 0)):
+        if row_id is None or not delta:
+            continue
+        model = column.class_
+        await db.execute(update(model).where(model.id == row_id).values({column: column + delta}))
+        tables.append(model.__tablename__)
+    return tables
+
+
+async def insert_returning(
+    db: AsyncSession, model: Any, values: Dict[str, Any], counters: Sequence[CounterDelta] = ()
+) -> Any:
+    # INSERT ... RETURNING hands back server defaults (ids, created_at) with the write,
+    # so no refresh SELECT is needed after commit.
+    instance = await db.scalar(insert(model).values(**values).returning(model))
+    tables = await apply_counters(db, counters)
+    await bump_versions(db, model.__tablename__, *tables)
+    await db.commit()
+    return instance
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: Any,
+    instance_id: int,
+    values: Dict[str, Any],
+    counters: Sequence[CounterDelta] = (),
+) -> Optional[Any]:
+    if not values:
+        return await db.get(model, instance_id)
+    instance = await db.scalar(
+        update(model).where(model.id == instance_id).values(**values).returning(model)
+    )
+    if instance is not None:
+        tables = await apply_counters(db, counters)
+        await bump_versions(db, model.__tablename__, *tables)
+    await db.commit()
+    return instance
+
+
+async def delete_instance(db: AsyncSession, instance: Any, counters: Sequence[CounterDelta] = ()) -> Any:
+    await db.delete(instance)
+    tables = await apply_counters(db, counters)
+    await bump_versions(db, instance.__tablename__, *tables)
+    await db.commit()
+    return instance
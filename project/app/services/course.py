@@ -1,49 +1,89 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate
 from app.models.course import Course
-from app.schemas.course import CourseCreate, CourseUpdate
-
-
-def create_course(db: Session, course_in: CourseCreate) -> Course:
+from app.models.section import Section
+from app.models.user import User
+from app.schemas.course import CourseCreate, CourseRead, CourseUpdate
+from app.services.common import (
+    cached_at_versions,
+    delete_instance,
+    exist,
+    get_scoped,
+    insert_returning,
+    list_scoped_rows,
+    read_columns,
+    update_returning,
+)
+
+
+async def create_course(db: AsyncSession, course_in: CourseCreate) -> Course:
     if course_in.section_id is None:
         raise ValueError("section_id is required to create a course")
 
-    course = Course(**course_in.dict())
-    db.add(course)
-    db.commit()
-    db.refresh(course)
+    course = await insert_returning(db, Course, course_in.dict())
+    await invalidate(("courses_by_section", course.section_id))
     return course
 
 
-def get_courses_by_section(db: Session, section_id: int) -> List[Course]:
-    return db.query(Course).filter(Course.section_id == section_id).order_by(Course.id).all()
+async def get_courses_in_section(db: AsyncSession, section_id: int) -> Optional[List[dict]]:
+    return await list_scoped_rows(
+        db, Section, section_id, Course, Course.section_id, read_columns(Course, CourseRead)
+    )
 
 
-def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
-    return db.get(Course, course_id)
+async def get_cached_courses_in_section(
+    db: AsyncSession, section_id: int, known_versions: Optional[Dict[str, int]] = None
+) -> Optional[List[dict]]:
+    return await cached_at_versions(
+        db,
+        "courses_by_section",
+        section_id,
+        (Section.__tablename__, Course.__tablename__),
+        lambda: get_courses_in_section(db, section_id),
+        known_versions,
+    )
 
 
-def update_course(db: Session, course_id: int, course_in: CourseUpdate) -> Optional[Course]:
-    course = get_course_by_id(db, course_id)
-    if not course:
-        return None
+async def get_course_in_section(
+    db: AsyncSession, section_id: int, course_id: int
+) -> Tuple[bool, Optional[Course]]:
+    return await get_scoped(db, Section, section_id, Course, Course.section_id, course_id)
+
+
+async def check_references(
+    db: AsyncSession, section_id: int, teacher_id: Optional[int]
+) -> Tuple[bool, bool]:
+    if teacher_id is None:
+        (section_exists,) = await exist(db, Section.id == section_id)
+        return section_exists, True
+    section_exists, teacher_exists = await exist(db, Section.id == section_id, User.id == teacher_id)
+    return section_exists, teacher_exists
+
+
+async def get_course_by_id(db: AsyncSession, course_id: int) -> Optional[Course]:
+    return await db.get(Course, course_id)
 
-    for field, value in course_in.dict(exclude_unset=True).items():
-        setattr(course, field, value)
 
-    db.add(course)
-    db.commit()
-    db.refresh(course)
+async def update_course(db: AsyncSession, course_id: int, course_in: CourseUpdate) -> Optional[Course]:
+    previous = await get_course_by_id(db, course_id)
+    previous_section_id = previous.section_id if previous else None
+    course = await update_returning(db, Course, course_id, course_in.dict(exclude_unset=True))
+    if course:
+        await invalidate(
+            ("courses_by_section", previous_section_id),
+            ("courses_by_section", course.section_id),
+        )
     return course
 
 
-def delete_course(db: Session, course_id: int) -> Optional[Course]:
-    course = get_course_by_id(db, course_id)
+async def delete_course(db: AsyncSession, course_id: int) -> Optional[Course]:
+    course = await get_course_by_id(db, course_id)
     if not course:
         return None
 
-    db.delete(course)
-    db.commit()
+    course = await delete_instance(db, course)
+    await invalidate(("courses_by_section", course.section_id))
     return course
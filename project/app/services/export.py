@@ -0,0 +1,41 @@
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book
+from app.models.student_section import StudentSection
+from app.models.user import User
+from app.schemas.book import BookRead
+from app.schemas.student_section import StudentSectionRead
+from app.schemas.user import UserRead
+
+EXPORT_BATCH_SIZE = 1000
+
+# Exportable columns are those of each entity's Read schema, so secrets such as
+# password_hash can never be selected.
+EXPORTS: Dict[str, Tuple[Any, Any]] = {
+    "users": (User, UserRead),
+    "enrollments": (StudentSection, StudentSectionRead),
+    "books": (Book, BookRead),
+}
+
+
+def export_columns(entity: str) -> List[str]:
+    _, schema = EXPORTS[entity]
+    return list(schema.model_fields)
+
+
+async def stream_rows(
+    db: AsyncSession, entity: str, columns: List[str], batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[Sequence[Row]]:
+    model, _ = EXPORTS[entity]
+    # A server-side cursor fetched in batches keeps memory flat whatever the table size.
+    result = await db.stream(
+        select(*(getattr(model, column) for column in columns))
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions():
+        yield rows
@@ -1,46 +1,63 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate
 from app.models.grade import Grade
-from app.schemas.grade import GradeCreate, GradeUpdate
+from app.schemas.grade import GradeCreate, GradeRead, GradeUpdate
+from app.services.common import (
+    cached_at_versions,
+    delete_instance,
+    insert_returning,
+    read_columns,
+    update_returning,
+)
+
+
+async def create_grade(db: AsyncSession, grade_in: GradeCreate) -> Grade:
+    grade = await insert_returning(db, Grade, grade_in.dict())
+    await invalidate(("grades", "all"))
+    return grade
 
 
-def create_grade(db: Session, grade_in: GradeCreate) -> Grade:
-    grade = Grade(**grade_in.dict())
-    db.add(grade)
-    db.commit()
-    db.refresh(grade)
-    return grade
+async def get_grades(db: AsyncSession) -> List[dict]:
+    rows = await db.execute(select(*read_columns(Grade, GradeRead)).order_by(Grade.id))
+    return [row._asdict() for row in rows]
 
 
-def get_grades(db: Session) -> List[Grade]:
-    return db.query(Grade).order_by(Grade.id).all()
+async def get_cached_grades(db: AsyncSession, known_versions: Optional[Dict[str, int]] = None) -> List[dict]:
+    return await cached_at_versions(
+        db, "grades", "all", (Grade.__tablename__,), lambda: get_grades(db), known_versions
+    )
 
 
-def get_grade_by_id(db: Session, grade_id: int) -> Optional[Grade]:
-    return db.get(Grade, grade_id)
+async def get_grade_by_id(db: AsyncSession, grade_id: int) -> Optional[Grade]:
+    return await db.get(Grade, grade_id)
 
 
-def update_grade(db: Session, grade_id: int, grade_in: GradeUpdate) -> Optional[Grade]:
-    grade = get_grade_by_id(db, grade_id)
-    if not grade:
-        return None
+async def get_cached_grade(
+    db: AsyncSession, grade_id: int, known_versions: Optional[Dict[str, int]] = None
+) -> Optional[dict]:
+    async def load() -> Optional[dict]:
+        grade = await get_grade_by_id(db, grade_id)
+        return GradeRead.model_validate(grade).model_dump() if grade else None
+
+    return await cached_at_versions(db, "grade", grade_id, (Grade.__tablename__,), load, known_versions)
 
-    for field, value in grade_in.dict(exclude_unset=True).items():
-        setattr(grade, field, value)
 
-    db.add(grade)
-    db.commit()
-    db.refresh(grade)
+async def update_grade(db: AsyncSession, grade_id: int, grade_in: GradeUpdate) -> Optional[Grade]:
+    grade = await update_returning(db, Grade, grade_id, grade_in.dict(exclude_unset=True))
+    if grade:
+        await invalidate(("grade", grade_id), ("grades", "all"))
     return grade
 
 
-def delete_grade(db: Session, grade_id: int) -> Optional[Grade]:
-    grade = get_grade_by_id(db, grade_id)
+async def delete_grade(db: AsyncSession, grade_id: int) -> Optional[Grade]:
+    grade = await get_grade_by_id(db, grade_id)
     if not grade:
         return None
 
-    db.delete(grade)
-    db.commit()
+    grade = await delete_instance(db, grade)
+    await invalidate(("grade", grade_id), ("grades", "all"), ("sections_by_grade", grade_id))
     return grade
@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+from sqlalchemy import func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Subquery
+
+from app.models.course import Course
+from app.models.section import Section
+from app.models.user import User
+
+# Per-course figures come from the counters kept on courses and sections, so the
+# reports never touch books or student_sections.
+COURSE_COLUMNS = (
+    Course.id,
+    Course.name,
+    Course.section_id,
+    Section.name.label("section_name"),
+    Section.grade_id,
+    Course.book_count,
+    Section.student_count,
+)
+
+# Who both reports treat as a teacher: role "teacher", or assigned to at least one
+# course (course writes do not check the role). Every course therefore appears in
+# both reports, and teachers without courses still show.
+IS_TEACHER = or_(User.role == "teacher", Course.id.is_not(None))
+
+
+async def get_teaching_summary(db: AsyncSession, user_id: int) -> Optional[dict]:
+    rows = (
+        await db.execute(
+            select(User.id, User.full_name, *COURSE_COLUMNS)
+            .select_from(User)
+            .outerjoin(Course, Course.teacher_id == User.id)
+            .outerjoin(Section, Section.id == Course.section_id)
+            .where(User.id == user_id, IS_TEACHER)
+            .order_by(Course.id)
+        )
+    ).all()
+    if not rows:
+        return None
+    names = [column.key for column in COURSE_COLUMNS]
+    courses = [dict(zip(names, row[2:])) for row in rows if row[2] is not None]
+    return {
+        "teacher_id": rows[0][0],
+        "full_name": rows[0][1],
+        "course_count": len(courses),
+        "book_count": sum(course["book_count"] for course in courses),
+        "student_count": sum(course["student_count"] for course in courses),
+        "courses": courses,
+    }
+
+
+def _teacher_page(limit: int, after_id: Optional[int]) -> Subquery:
+    # IS_TEACHER as a UNION of two index walks (ix_users_role_id and
+    # ix_courses_teacher_id_id), each cut to one page, so a page costs O(limit)
+    # rather than a scan of every user.
+    role_ids = select(User.id.label("id")).where(User.role == "teacher")
+    course_ids = select(Course.teacher_id.label("id")).distinct()
+    if after_id is not None:
+        role_ids = role_ids.where(User.id > after_id)
+        course_ids = course_ids.where(Course.teacher_id > after_id)
+    branches = [query.order_by("id").limit(limit).subquery() for query in (role_ids, course_ids)]
+    candidates = union(*(select(branch.c.id) for branch in branches)).subquery()
+    return select(candidates.c.id).order_by(candidates.c.id).limit(limit).subquery()
+
+
+async def get_teacher_reports(db: AsyncSession, limit: int, after_id: Optional[int] = None) -> List[dict]:
+    page = _teacher_page(limit, after_id)
+    statement = (
+        select(
+            User.id.label("teacher_id"),
+            User.full_name,
+            User.email,
+            func.count(Course.id).label("course_count"),
+            func.coalesce(func.sum(Course.book_count), 0).label("book_count"),
+            func.coalesce(func.sum(Section.student_count), 0).label("student_count"),
+        )
+        .select_from(page)
+        .join(User, User.id == page.c.id)
+        .outerjoin(Course, Course.teacher_id == User.id)
+        .outerjoin(Section, Section.id == Course.section_id)
+        .group_by(User.id)
+        .order_by(User.id)
+    )
+    return [dict(row) for row in (await db.execute(statement)).mappings()]
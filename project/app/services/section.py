@@ -1,49 +1,80 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate
+from app.models.grade import Grade
 from app.models.section import Section
-from app.schemas.section import SectionCreate, SectionUpdate
-
-
-def create_section(db: Session, section_in: SectionCreate) -> Section:
+from app.schemas.section import SectionCreate, SectionRead, SectionUpdate
+from app.services.common import (
+    cached_at_versions,
+    delete_instance,
+    get_scoped,
+    insert_returning,
+    list_scoped_rows,
+    read_columns,
+    update_returning,
+)
+
+
+async def create_section(db: AsyncSession, section_in: SectionCreate) -> Section:
     if section_in.grade_id is None:
         raise ValueError("grade_id is required to create a section")
 
-    section = Section(**section_in.dict())
-    db.add(section)
-    db.commit()
-    db.refresh(section)
+    section = await insert_returning(db, Section, section_in.dict())
+    await invalidate(("sections_by_grade", section.grade_id))
     return section
 
 
-def get_sections_by_grade(db: Session, grade_id: int) -> List[Section]:
-    return db.query(Section).filter(Section.grade_id == grade_id).order_by(Section.id).all()
+async def get_sections_in_grade(db: AsyncSession, grade_id: int) -> Optional[List[dict]]:
+    return await list_scoped_rows(
+        db, Grade, grade_id, Section, Section.grade_id, read_columns(Section, SectionRead)
+    )
 
 
-def get_section_by_id(db: Session, section_id: int) -> Optional[Section]:
-    return db.get(Section, section_id)
+async def get_cached_sections_in_grade(
+    db: AsyncSession, grade_id: int, known_versions: Optional[Dict[str, int]] = None
+) -> Optional[List[dict]]:
+    return await cached_at_versions(
+        db,
+        "sections_by_grade",
+        grade_id,
+        (Grade.__tablename__, Section.__tablename__),
+        lambda: get_sections_in_grade(db, grade_id),
+        known_versions,
+    )
 
 
-def update_section(db: Session, section_id: int, section_in: SectionUpdate) -> Optional[Section]:
-    section = get_section_by_id(db, section_id)
-    if not section:
-        return None
+async def get_section_in_grade(
+    db: AsyncSession, grade_id: int, section_id: int
+) -> Tuple[bool, Optional[Section]]:
+    return await get_scoped(db, Grade, grade_id, Section, Section.grade_id, section_id)
+
+
+async def get_section_by_id(db: AsyncSession, section_id: int) -> Optional[Section]:
+    return await db.get(Section, section_id)
 
-    for field, value in section_in.dict(exclude_unset=True).items():
-        setattr(section, field, value)
 
-    db.add(section)
-    db.commit()
-    db.refresh(section)
+async def update_section(
+    db: AsyncSession, section_id: int, section_in: SectionUpdate
+) -> Optional[Section]:
+    # The router has usually loaded the row already, so this is an identity-map hit.
+    previous = await get_section_by_id(db, section_id)
+    previous_grade_id = previous.grade_id if previous else None
+    section = await update_returning(db, Section, section_id, section_in.dict(exclude_unset=True))
+    if section:
+        await invalidate(
+            ("sections_by_grade", previous_grade_id),
+            ("sections_by_grade", section.grade_id),
+        )
     return section
 
 
-def delete_section(db: Session, section_id: int) -> Optional[Section]:
-    section = get_section_by_id(db, section_id)
+async def delete_section(db: AsyncSession, section_id: int) -> Optional[Section]:
+    section = await get_section_by_id(db, section_id)
     if not section:
         return None
 
-    db.delete(section)
-    db.commit()
+    section = await delete_instance(db, section)
+    await invalidate(("sections_by_grade", section.grade_id), ("courses_by_section", section_id))
     return section
@@ -1,80 +1,175 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.section import Section
 from app.models.student_section import StudentSection
 from app.models.user import User
-from app.schemas.student_section import StudentSectionCreate, StudentSectionUpdate
-
-
-def enroll_student(db: Session, section_id: int, enrollment_in: StudentSectionCreate) -> StudentSection:
-    existing = (
-        db.query(StudentSection)
-        .filter(
+from app.schemas.student_section import (
+    StudentSectionBulkResult,
+    StudentSectionCreate,
+    StudentSectionUpdate,
+)
+from app.services import catalog as catalog_service
+from app.services.common import (
+    apply_counters,
+    bump_versions,
+    delete_instance,
+    exist,
+    get_scoped,
+    insert_returning,
+    update_returning,
+)
+
+
+async def enroll_student(
+    db: AsyncSession, section_id: int, enrollment_in: StudentSectionCreate
+) -> StudentSection:
+    existing = await db.scalar(
+        select(StudentSection.id).where(
             StudentSection.section_id == section_id,
             StudentSection.student_id == enrollment_in.student_id,
         )
-        .first()
     )
     if existing:
         raise ValueError("Student already enrolled in this section")
 
-    enrollment = StudentSection(student_id=enrollment_in.student_id, section_id=section_id)
-    db.add(enrollment)
-    db.commit()
-    db.refresh(enrollment)
+    enrollment = await insert_returning(
+        db,
+        StudentSection,
+        {"student_id": enrollment_in.student_id, "section_id": section_id},
+        counters=[(Section.student_count, section_id, 1)],
+    )
+    await catalog_service.invalidate_libraries(enrollment.student_id)
     return enrollment
 
 
-def get_enrollment_by_id(db: Session, enrollment_id: int) -> Optional[StudentSection]:
-    return db.get(StudentSection, enrollment_id)
+async def enroll_students(
+    db: AsyncSession, section_id: int, student_ids: List[int]
+) -> StudentSectionBulkResult:
+    requested = list(dict.fromkeys(student_ids))
+    existing = set(await db.scalars(select(User.id).where(User.id.in_(requested))))
+    candidates = [student_id for student_id in requested if student_id in existing]
+
+    inserted = set()
+    if candidates:
+        # Rows already enrolled hit uq_student_section and are simply not returned.
+        statement = (
+            pg_insert(StudentSection)
+            .values([{"student_id": student_id, "section_id": section_id} for student_id in candidates])
+            .on_conflict_do_nothing(constraint="uq_student_section")
+            .returning(StudentSection.student_id)
+        )
+        inserted = set(await db.scalars(statement))
+        if inserted:
+            tables = await apply_counters(db, [(Section.student_count, section_id, len(inserted))])
+            await bump_versions(db, StudentSection.__tablename__, *tables)
+        await db.commit()
+        await catalog_service.invalidate_libraries(*inserted)
+
+    return StudentSectionBulkResult(
+        inserted=[student_id for student_id in candidates if student_id in inserted],
+        skipped=[student_id for student_id in candidates if student_id not in inserted],
+        missing=[student_id for student_id in requested if student_id not in existing],
+    )
+
+
+async def get_enrollment_by_id(db: AsyncSession, enrollment_id: int) -> Optional[StudentSection]:
+    return await db.get(StudentSection, enrollment_id)
 
 
-def get_students_in_section(db: Session, section_id: int) -> List[User]:
-    return (
-        db.query(User)
-        .join(StudentSection, StudentSection.student_id == User.id)
-        .filter(StudentSection.section_id == section_id)
-        .order_by(User.id)
-        .all()
+async def get_enrollment_in_section(
+    db: AsyncSession, section_id: int, enrollment_id: int
+) -> Tuple[bool, Optional[StudentSection]]:
+    return await get_scoped(
+        db, Section, section_id, StudentSection, StudentSection.section_id, enrollment_id
     )
 
 
-def update_enrollment(
-    db: Session, section_id: int, enrollment_id: int, enrollment_in: StudentSectionUpdate
+async def check_references(
+    db: AsyncSession, section_id: int, student_id: Optional[int]
+) -> Tuple[bool, bool]:
+    if student_id is None:
+        (section_exists,) = await exist(db, Section.id == section_id)
+        return section_exists, True
+    section_exists, student_exists = await exist(db, Section.id == section_id, User.id == student_id)
+    return section_exists, student_exists
+
+
+ROSTER_COLUMNS = (
+    StudentSection.id.label("enrollment_id"),
+    StudentSection.student_id,
+    User.full_name,
+    User.email,
+)
+
+
+async def get_roster(
+    db: AsyncSession,
+    section_id: int,
+    limit: int,
+    sort: str = "id",
+    after: Optional[Sequence[Any]] = None,
+) -> Optional[List[dict]]:
+    # sort="id" walks ix_student_sections_section_id_student_id; sort="name" can
+    # walk ix_users_full_name_id and stop after one page on large sections.
+    order = (User.full_name, User.id) if sort == "name" else (StudentSection.student_id,)
+    query = (
+        select(*ROSTER_COLUMNS)
+        .join(User, User.id == StudentSection.student_id)
+        .where(StudentSection.section_id == section_id)
+    )
+    if after is not None:
+        query = query.where(tuple_(*order) > tuple_(*after))
+    rows = await db.execute(query.order_by(*order).limit(limit))
+    roster = [row._asdict() for row in rows]
+    # Only an empty page needs to tell a missing section from an empty one.
+    if not roster and not (await exist(db, Section.id == section_id))[0]:
+        return None
+    return roster
+
+
+async def update_enrollment(
+    db: AsyncSession, section_id: int, enrollment_id: int, enrollment_in: StudentSectionUpdate
 ) -> Optional[StudentSection]:
-    enrollment = get_enrollment_by_id(db, enrollment_id)
+    enrollment = await get_enrollment_by_id(db, enrollment_id)
     if not enrollment or enrollment.section_id != section_id:
         return None
 
     update_data = enrollment_in.dict(exclude_unset=True)
+    previous_student_id = enrollment.student_id
     new_student_id = update_data.get("student_id")
+    values = {}
 
     if new_student_id is not None:
-        duplicate = (
-            db.query(StudentSection.id)
-            .filter(
+        duplicate = await db.scalar(
+            select(StudentSection.id).where(
                 StudentSection.section_id == section_id,
                 StudentSection.student_id == new_student_id,
                 StudentSection.id != enrollment_id,
             )
-            .first()
         )
         if duplicate:
             raise ValueError("Student already enrolled in this section")
-        enrollment.student_id = new_student_id
+        values["student_id"] = new_student_id
 
-    db.add(enrollment)
-    db.commit()
-    db.refresh(enrollment)
+    enrollment = await update_returning(db, StudentSection, enrollment_id, values)
+    if enrollment:
+        await catalog_service.invalidate_libraries(previous_student_id, enrollment.student_id)
     return enrollment
 
 
-def delete_enrollment(db: Session, section_id: int, enrollment_id: int) -> Optional[StudentSection]:
-    enrollment = get_enrollment_by_id(db, enrollment_id)
+async def delete_enrollment(
+    db: AsyncSession, section_id: int, enrollment_id: int
+) -> Optional[StudentSection]:
+    enrollment = await get_enrollment_by_id(db, enrollment_id)
     if not enrollment or enrollment.section_id != section_id:
         return None
 
-    db.delete(enrollment)
-    db.commit()
+    enrollment = await delete_instance(
+        db, enrollment, counters=[(Section.student_count, enrollment.section_id, -1)]
+    )
+    await catalog_service.invalidate_libraries(enrollment.student_id)
     return enrollment
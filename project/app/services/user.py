@@ -1,82 +1,159 @@
-from typing import List, Optional
+from typing import Awaitable, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.models.book import Book
 from app.models.course import Course
+from app.models.section import Section
 from app.models.student_section import StudentSection
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.services import catalog as catalog_service
+from app.services.common import (
+    apply_counters,
+    bump_versions,
+    exist,
+    insert_returning,
+    read_columns,
+    update_returning,
+)
+
+
+async def _check_email_available(db: AsyncSession, email: str, user_id: Optional[int] = None) -> None:
+    # Same lower() predicate as login and ix_users_email_lower.
+    condition = func.lower(User.email) == email.lower()
+    if user_id is not None:
+        condition = and_(condition, User.id != user_id)
+    (taken,) = await exist(db, condition)
+    if taken:
+        raise ValueError("Email already registered")
+
+
+async def _write_user(db: AsyncSession, write: Awaitable[Optional[User]]) -> Optional[User]:
+    try:
+        return await write
+    except IntegrityError:
+        # Another request registered the email between the check and the write.
+        await db.rollback()
+        raise ValueError("Email already registered") from None
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
+async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     user_data = user_in.dict()
     password = user_data.pop("password")
-    user_data["password_hash"] = hash_password(password)
-    user = User(**user_data)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    user_data["password_hash"] = await hash_password_async(password)
+    await _check_email_available(db, user_data["email"])
+    return await _write_user(db, insert_returning(db, User, user_data))
 
 
-def get_users(db: Session) -> List[User]:
-    return db.query(User).all()
+async def get_users(
+    db: AsyncSession,
+    limit: int,
+    after_id: Optional[int] = None,
+    role: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+) -> List[dict]:
+    query = select(*read_columns(User, UserRead))
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    if role is not None:
+        query = query.where(User.role == role)
+    if name_prefix:
+        escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.where(User.full_name.ilike(f"{escaped}%", escape="\\"))
+    rows = await db.execute(query.order_by(User.id).limit(limit))
+    return [row._asdict() for row in rows]
 
 
-def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
-    return db.get(User, user_id)
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
 
 
-def update_user(db: Session, user_id: int, user_in: UserUpdate) -> Optional[User]:
-    user = get_user_by_id(db, user_id)
-    if not user:
-        return None
+async def check_exists(db: AsyncSession, *user_ids: int) -> Tuple[bool, ...]:
+    return await exist(db, *(User.id == user_id for user_id in user_ids))
+
 
+async def update_user(db: AsyncSession, user_id: int, user_in: UserUpdate) -> Optional[User]:
     update_data = user_in.dict(exclude_unset=True)
     password = update_data.pop("password", None)
+    # Hash before touching the database so no connection is checked out meanwhile.
     if password is not None:
-        update_data["password_hash"] = hash_password(password)
+        update_data["password_hash"] = await hash_password_async(password)
 
-    for field, value in update_data.items():
-        setattr(user, field, value)
+    if update_data.get("email") is not None:
+        await _check_email_available(db, update_data["email"], user_id)
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await _write_user(db, update_returning(db, User, user_id, update_data))
 
 
-def delete_user(db: Session, user_id: int) -> Optional[User]:
-    user = get_user_by_id(db, user_id)
+async def delete_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    user = await get_user_by_id(db, user_id)
     if not user:
         return None
 
     # Prevent orphaned records by ensuring the user is not referenced elsewhere.
-    teaches_courses = db.query(Course.id).filter(Course.teacher_id == user_id).first()
+    teaches_courses = await db.scalar(select(Course.id).where(Course.teacher_id == user_id).limit(1))
     if teaches_courses:
         raise ValueError("User is assigned as a teacher to existing courses")
 
-    created_books = db.query(Book.id).filter(Book.created_by == user_id).first()
+    created_books = await db.scalar(select(Book.id).where(Book.created_by == user_id).limit(1))
     if created_books:
         raise ValueError("User is referenced as the creator of existing books")
 
     # Clean up enrollments before deleting the user to avoid NOT NULL violations.
-    db.query(StudentSection).filter(StudentSection.student_id == user_id).delete(
-        synchronize_session=False
+    section_ids = list(
+        await db.scalars(
+            delete(StudentSection)
+            .where(StudentSection.student_id == user_id)
+            .returning(StudentSection.section_id)
+            .execution_options(synchronize_session=False)
+        )
     )
+    tables = await apply_counters(db, [(Section.student_count, section_id, -1) for section_id in section_ids])
 
-    db.delete(user)
+    await db.delete(user)
+    await bump_versions(db, User.__tablename__, StudentSection.__tablename__, *tables)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await catalog_service.invalidate_libraries(user_id)
     return user
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(func.lower(User.email) == email.lower()))
+
+
+async def get_credentials_by_email(db: AsyncSession, email: str) -> Optional[Row]:
+    # Columns only: the password hash plus the public fields the login response returns.
+    return (
+        await db.execute(
+            select(User.password_hash, *read_columns(User, UserRead))
+            .where(func.lower(User.email) == email.lower())
+        )
+    ).first()
+
+
+async def get_role(db: AsyncSession, user_id: int) -> Optional[str]:
+    return await db.scalar(select(User.role).where(User.id == user_id))
+
+
+async def replace_password_hash(
+    db: AsyncSession, user_id: int, current_hash: str, new_hash: str
+) -> bool:
+    # Compare-and-set so a password changed meanwhile is not overwritten. The hash
+    # is not part of any response, so the users version (ETags) is left alone.
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.password_hash == current_hash)
+        .values(password_hash=new_hash)
+    )
+    await db.commit()
+    return result.rowcount == 1
@@ -0,0 +1,92 @@
+"""Compare the sync (threadpool) and async database paths under concurrency.
+
+The sync path mirrors how Starlette runs ``def`` endpoints: a bounded thread
+pool (40 workers by default) where each request blocks a thread on psycopg2.
+The async path runs every request as a task on a single event loop.
+
+Run from ``project/`` against the database configured in ``.env``::
+
+    python -m benchmarks.async_vs_sync --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.connection import ASYNC_DATABASE_URL, DATABASE_URL
+
+QUERY = text("SELECT pg_sleep(:delay)")
+
+
+def summarize(name: str, elapsed: float, latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "path": name,
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def run_sync(total: int, threads: int, concurrency: int, delay: float) -> dict:
+    engine = create_engine(DATABASE_URL, pool_size=concurrency, max_overflow=0)
+    session_factory = sessionmaker(bind=engine)
+
+    def one(_: int) -> float:
+        start = time.perf_counter()
+        with session_factory() as db:
+            db.execute(QUERY, {"delay": delay})
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return summarize("sync", elapsed, latencies)
+
+
+async def run_async(total: int, concurrency: int, delay: float) -> dict:
+    engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=concurrency, max_overflow=0)
+    session_factory = async_sessionmaker(bind=engine)
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with limiter:
+            start = time.perf_counter()
+            async with session_factory() as db:
+                await db.execute(QUERY, {"delay": delay})
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return summarize("async", elapsed, list(latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="sync threadpool size")
+    parser.add_argument("--delay", type=float, default=0.01, help="simulated query time (s)")
+    args = parser.parse_args()
+
+    results = [
+        run_sync(args.requests, args.threads, args.concurrency, args.delay),
+        asyncio.run(run_async(args.requests, args.concurrency, args.delay)),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure worker cold start: legacy ``create_all`` on boot vs. the schema-version check.
+
+Spawns N processes at once, like ``uvicorn --workers N``. Each one imports the
+application, runs the chosen startup strategy and reports how long it took
+from process start until it could serve its first request.
+
+Run from ``project/`` after ``python -m app.database.migrations``::
+
+    python -m benchmarks.cold_start --workers 8
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import statistics
+import time
+from typing import List
+
+# A worker that has not reported by then is treated as hung.
+BOOT_TIMEOUT = 120.0
+
+
+def _boot(strategy: str, started_at: float, results) -> None:
+    from app.database.base import Base
+    from app.database.connection import engine
+    from app.database.migrations import check_schema_version
+    from app.main import app  # noqa: F401
+
+    if strategy == "create_all":
+        Base.metadata.create_all(bind=engine)
+    else:
+        check_schema_version(engine)
+    results.put(time.time() - started_at)
+
+
+def _collect(processes: list, results, strategy: str) -> List[float]:
+    timings: List[float] = []
+    deadline = time.monotonic() + BOOT_TIMEOUT
+    while len(timings) < len(processes):
+        try:
+            timings.append(results.get(timeout=1))
+        except queue.Empty:
+            failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"{strategy}: {len(failed)} worker(s) exited with codes {failed}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"{strategy}: only {len(timings)} of {len(processes)} workers booted "
+                    f"within {BOOT_TIMEOUT:.0f}s"
+                )
+    return timings
+
+
+def run(strategy: str, workers: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    started_at = time.time()
+    processes = [
+        context.Process(target=_boot, args=(strategy, started_at, results)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        timings = sorted(_collect(processes, results, strategy))
+    except RuntimeError:
+        for process in processes:
+            process.terminate()
+        raise
+    for process in processes:
+        process.join()
+    failed = [process.exitcode for process in processes if process.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"{strategy}: {len(failed)} worker(s) exited with codes {failed}")
+    return {
+        "strategy": strategy,
+        "workers": workers,
+        "first_ready_s": round(timings[0], 3),
+        "mean_ready_s": round(statistics.mean(timings), 3),
+        "all_ready_s": round(timings[-1], 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    print(json.dumps([run("create_all", args.workers), run("check", args.workers)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
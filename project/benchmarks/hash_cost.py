@@ -0,0 +1,73 @@
+"""Hash and verify time per password scheme and cost, to pick PASSWORD_HASH_ROUNDS.
+
+For each scheme, every cost in ``--costs`` is timed over ``--samples`` hashes and
+verifies. With ``--target-ms`` the report also names the highest cost whose
+verify median fits in that budget. That time is what one login spends in the hash
+pool, before queueing behind other logins.
+
+Run from ``project/``::
+
+    python -m benchmarks.hash_cost --schemes bcrypt_sha256 --costs 10 11 12 13 --target-ms 250
+
+Schemes needing optional backends (e.g. ``argon2`` with argon2-cffi) are reported
+as unavailable when the backend is missing. For argon2, the cost is its time_cost.
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import List, Optional
+
+from passlib.context import CryptContext
+from passlib.exc import MissingBackendError
+
+PASSWORD = "benchmark-password"
+
+
+def _median_ms(call, samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def measure(scheme: str, cost: int, samples: int) -> dict:
+    context = CryptContext(schemes=[scheme], **{f"{scheme}__rounds": cost})
+    hashed = context.hash(PASSWORD)
+    return {
+        "cost": cost,
+        "hash_ms": _median_ms(lambda: context.hash(PASSWORD), samples),
+        "verify_ms": _median_ms(lambda: context.verify(PASSWORD, hashed), samples),
+    }
+
+
+def run(schemes: List[str], costs: List[int], samples: int, target_ms: Optional[float]) -> dict:
+    report = {}
+    for scheme in schemes:
+        try:
+            results = [measure(scheme, cost, samples) for cost in costs]
+        except (MissingBackendError, ValueError, KeyError) as exc:
+            report[scheme] = {"error": str(exc) or type(exc).__name__}
+            continue
+        entry = {"results": results}
+        if target_ms is not None:
+            fitting = [result["cost"] for result in results if result["verify_ms"] <= target_ms]
+            entry["recommended_cost"] = max(fitting) if fitting else None
+        report[scheme] = entry
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", nargs="+", default=["bcrypt_sha256"])
+    parser.add_argument("--costs", nargs="+", type=int, default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=None)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemes, args.costs, args.samples, args.target_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Show how the listing indexes change the query plans of the hot listing queries.
+
+Everything runs inside one transaction that is rolled back at the end: the
+seeded rows and the dropped/recreated indexes never persist. Each query is run
+with EXPLAIN ANALYZE once without the step-4 listing indexes and once with them.
+
+Run from ``project/`` after ``python -m app.database.migrations``::
+
+    python -m benchmarks.index_plans --scale 1
+"""
+import argparse
+import json
+from typing import Dict, List
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from app.database.connection import engine
+from app.database.migrations import LISTING_INDEXES
+from app.models.book import Book
+from app.models.course import Course
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+from benchmarks.seed import Scale, seed
+
+
+def _queries(seeded) -> Dict[str, object]:
+    course_id = seeded.course_ids[len(seeded.course_ids) // 2]
+    section_id = seeded.section_ids[len(seeded.section_ids) // 2]
+    grade_id = seeded.grade_ids[len(seeded.grade_ids) // 2]
+    teacher_id = seeded.teacher_ids[len(seeded.teacher_ids) // 2]
+    return {
+        "books_by_course": select(Book).where(Book.course_id == course_id).order_by(Book.id),
+        "courses_by_section": select(Course).where(Course.section_id == section_id).order_by(Course.id),
+        "sections_by_grade": select(Section).where(Section.grade_id == grade_id).order_by(Section.id),
+        "students_in_section": select(User)
+        .join(StudentSection, StudentSection.student_id == User.id)
+        .where(StudentSection.section_id == section_id)
+        .order_by(User.id),
+        "delete_user_teacher_check": select(Course.id).where(Course.teacher_id == teacher_id).limit(1),
+        "delete_user_creator_check": select(Book.id).where(Book.created_by == teacher_id).limit(1),
+    }
+
+
+def _scans(node: dict) -> List[str]:
+    scans = []
+    if "Scan" in node["Node Type"]:
+        target = node.get("Index Name") or node.get("Relation Name")
+        scans.append(f"{node['Node Type']} on {target}")
+    for child in node.get("Plans", []):
+        scans.extend(_scans(child))
+    return scans
+
+
+def _explain(connection: Connection, statement) -> dict:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    plan = connection.scalar(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"))[0]
+    return {"scans": _scans(plan["Plan"]), "execution_ms": plan["Execution Time"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the default volumes")
+    args = parser.parse_args()
+
+    report = {}
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            seeded = seed(connection, Scale.scaled(args.scale))
+            queries = _queries(seeded)
+
+            for names in LISTING_INDEXES.values():
+                for name in names:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            connection.execute(text("ANALYZE"))
+            for name, statement in queries.items():
+                report[name] = {"without_indexes": _explain(connection, statement)}
+
+            for table, names in LISTING_INDEXES.items():
+                for index in table.indexes:
+                    if index.name in names:
+                        index.create(bind=connection)
+            connection.execute(text("ANALYZE"))
+            for name, statement in queries.items():
+                report[name]["with_indexes"] = _explain(connection, statement)
+        finally:
+            transaction.rollback()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Rows/sec of list responses: ORM + response_model validation vs. projected rows + orjson.
+
+Seeds one course with ``--rows`` books inside a transaction that is rolled back at
+the end, then builds the ``GET /courses/{course_id}/books`` body both ways:
+
+* ``orm``: ``select(Book)`` hydrated into the session, validated with
+  ``from_attributes`` and dumped the way FastAPI handles ``response_model``.
+* ``rows``: the projected column rows from ``get_books_in_course`` serialized by
+  ``json_response``.
+
+Run from ``project/``::
+
+    python -m benchmarks.list_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.responses import json_response
+from app.core.security import hash_password
+from app.database.connection import async_engine
+from app.models.book import Book
+from app.models.course import Course
+from app.models.grade import Grade
+from app.models.section import Section
+from app.models.user import User
+from app.schemas.book import BookRead
+from app.services.book import get_books_in_course
+
+CHUNK_SIZE = 1000
+
+books_adapter = TypeAdapter(List[BookRead])
+
+
+async def _seed(db: AsyncSession, rows: int) -> int:
+    teacher_id = await db.scalar(
+        insert(User)
+        .values(
+            full_name="Benchmark Teacher",
+            email="list-serialization@benchmark.local",
+            password_hash=hash_password("benchmark-password"),
+            role="teacher",
+        )
+        .returning(User.id)
+    )
+    grade_id = await db.scalar(insert(Grade).values(name="bench-list-serialization").returning(Grade.id))
+    section_id = await db.scalar(insert(Section).values(name="A", grade_id=grade_id).returning(Section.id))
+    course_id = await db.scalar(
+        insert(Course)
+        .values(name="Benchmark", section_id=section_id, teacher_id=teacher_id)
+        .returning(Course.id)
+    )
+    for start in range(0, rows, CHUNK_SIZE):
+        await db.execute(
+            insert(Book),
+            [
+                {
+                    "title": f"Libro {n}",
+                    "author": f"Autor {n % 500}",
+                    "description": "Texto de referencia para el curso. " * 4,
+                    "file_url": f"https://files.example.com/books/{n}.pdf",
+                    "category": "Lectura",
+                    "course_id": course_id,
+                    "created_by": teacher_id,
+                }
+                for n in range(start, min(start + CHUNK_SIZE, rows))
+            ],
+        )
+    return course_id
+
+
+async def orm_body(db: AsyncSession, course_id: int) -> bytes:
+    books = (
+        await db.scalars(select(Book).where(Book.course_id == course_id).order_by(Book.id))
+    ).all()
+    validated = books_adapter.validate_python(books, from_attributes=True)
+    content = books_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def rows_body(db: AsyncSession, course_id: int) -> bytes:
+    return json_response(await get_books_in_course(db, course_id)).body
+
+
+async def measure(
+    db: AsyncSession, build: Callable[[AsyncSession, int], Awaitable[bytes]], course_id: int, repeat: int
+) -> dict:
+    timings, size = [], 0
+    for _ in range(repeat):
+        # A fresh identity map per run, as each request gets its own session.
+        db.expunge_all()
+        start = time.perf_counter()
+        body = await build(db, course_id)
+        timings.append(time.perf_counter() - start)
+        size = len(body)
+    median = statistics.median(timings)
+    return {
+        "median_ms": round(median * 1000, 2),
+        "best_ms": round(min(timings) * 1000, 2),
+        "bytes": size,
+    }
+
+
+async def run(rows: int, repeat: int) -> dict:
+    try:
+        async with async_engine.connect() as connection:
+            transaction = await connection.begin()
+            db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+            try:
+                course_id = await _seed(db, rows)
+                results = {
+                    "orm": await measure(db, orm_body, course_id, repeat),
+                    "rows": await measure(db, rows_body, course_id, repeat),
+                }
+            finally:
+                await db.close()
+                await transaction.rollback()
+    finally:
+        await async_engine.dispose()
+
+    for result in results.values():
+        result["rows_per_sec"] = round(rows / (result["median_ms"] / 1000))
+    results["speedup"] = round(results["orm"]["median_ms"] / results["rows"]["median_ms"], 2)
+    return {"books": rows, "repeat": repeat, **results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""Replay a realistic request mix against the ASGI app; throughput and p50/p95/p99 per route.
+
+Seeds a catalog with ``benchmarks.seed`` at ``--scale``, then sends ``--requests``
+requests with ``--concurrency`` in flight to ``app.main.app`` in-process.
+The requests are drawn from one of two mixes:
+
+* ``term-start``: login-heavy. Students sign in, refresh tokens, open their
+  section and its courses, and teachers bulk-enroll students.
+* ``weekday``: browse-heavy. Clients walk grades → sections → courses → books,
+  revalidate lists with ``If-None-Match``, open catalog trees and search.
+
+The request sequence depends only on ``--seed``, so two commits can be compared
+on the same workload. The JSON report goes to stdout and, with ``--output``, to a file.
+
+``--database postgres`` (default) uses the database from ``.env``, which must be
+migrated; seeded rows are deleted afterwards. ``--database sqlite`` builds a
+throwaway SQLite file instead (through ``aiosqlite``, pinned in requirements.txt).
+It is useful for comparing commits without a server, but its numbers are not
+comparable with Postgres. Book search is Postgres-only and is left out of the
+SQLite mix.
+
+Run from ``project/``::
+
+    python -m benchmarks.load --mix weekday --scale 0.2 --requests 5000 --concurrency 50
+    python -m benchmarks.load --mix term-start --database sqlite --output term-start.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import Computed, create_engine, delete, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.core.instrumentation import instrument_engine
+from app.core.security import shutdown_hash_executor
+from app.core.tokens import ACCESS_TOKEN, REFRESH_TOKEN, create_token
+from app.database import connection as db_connection
+from app.database.migrations import migrate
+from app.main import app
+from app.models.book import Book
+from app.models.course import Course
+from app.models.grade import Grade
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+from benchmarks.seed import SEED_PASSWORD, Scale, Seeded, seed
+
+MIXES: Dict[str, List[Tuple[str, int]]] = {
+    "term-start": [
+        ("login", 40),
+        ("refresh", 10),
+        ("me", 10),
+        ("section_courses", 10),
+        ("section_students", 10),
+        ("course_books", 10),
+        ("grade_tree", 5),
+        ("enroll", 5),
+    ],
+    "weekday": [
+        ("grades", 8),
+        ("grade_sections", 10),
+        ("section_courses", 12),
+        ("course_books", 20),
+        ("course_books_revalidate", 10),
+        ("search", 8),
+        ("grade_tree", 8),
+        ("catalog_tree", 1),
+        ("users", 5),
+        ("user", 5),
+        ("login", 5),
+        ("me", 8),
+    ],
+}
+POSTGRES_ONLY = {"search"}
+SEARCH_TERMS = ["algebra", "historia", "quimica", "literatura", "geometria", "Autor 12", "biologa"]
+
+
+@dataclass
+class Call:
+    route: str
+    method: str
+    url: str
+    json: Optional[dict] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Send the ETag last seen for this URL as If-None-Match.
+    revalidate: bool = False
+
+
+class Workload:
+    def __init__(self, seeded: Seeded, rng: random.Random) -> None:
+        self.seeded = seeded
+        self.rng = rng
+
+    def _student(self) -> int:
+        return self.rng.choice(self.seeded.student_ids)
+
+    def _bearer(self, token_type: str) -> str:
+        return create_token(self._student(), "student", token_type)
+
+    def login(self) -> Call:
+        email = self.seeded.student_emails[self._student()]
+        return Call("POST /auth/login", "POST", "/auth/login", {"email": email, "password": SEED_PASSWORD})
+
+    def refresh(self) -> Call:
+        body = {"refresh_token": self._bearer(REFRESH_TOKEN)}
+        return Call("POST /auth/refresh", "POST", "/auth/refresh", body)
+
+    def me(self) -> Call:
+        headers = {"Authorization": f"Bearer {self._bearer(ACCESS_TOKEN)}"}
+        return Call("GET /auth/me", "GET", "/auth/me", headers=headers)
+
+    def grades(self) -> Call:
+        return Call("GET /grades/", "GET", "/grades/")
+
+    def grade_sections(self) -> Call:
+        grade_id = self.rng.choice(self.seeded.grade_ids)
+        return Call("GET /grades/{grade_id}/sections/", "GET", f"/grades/{grade_id}/sections/")
+
+    def section_courses(self) -> Call:
+        section_id = self.rng.choice(self.seeded.section_ids)
+        return Call("GET /sections/{section_id}/courses/", "GET", f"/sections/{section_id}/courses/")
+
+    def section_students(self) -> Call:
+        section_id = self.rng.choice(self.seeded.section_ids)
+        return Call("GET /sections/{section_id}/students", "GET", f"/sections/{section_id}/students")
+
+    def course_books(self) -> Call:
+        course_id = self.rng.choice(self.seeded.course_ids)
+        return Call("GET /courses/{course_id}/books/", "GET", f"/courses/{course_id}/books/")
+
+    def course_books_revalidate(self) -> Call:
+        call = self.course_books()
+        call.route += " (If-None-Match)"
+        call.revalidate = True
+        return call
+
+    def search(self) -> Call:
+        term = self.rng.choice(SEARCH_TERMS)
+        return Call("GET /books/search", "GET", f"/books/search?q={term}")
+
+    def grade_tree(self) -> Call:
+        grade_id = self.rng.choice(self.seeded.grade_ids)
+        return Call("GET /grades/{grade_id}/tree", "GET", f"/grades/{grade_id}/tree")
+
+    def catalog_tree(self) -> Call:
+        return Call("GET /catalog/tree", "GET", "/catalog/tree")
+
+    def users(self) -> Call:
+        return Call("GET /users/", "GET", "/users/?role=student&limit=50")
+
+    def user(self) -> Call:
+        return Call("GET /users/{user_id}", "GET", f"/users/{self._student()}")
+
+    def enroll(self) -> Call:
+        section_id = self.rng.choice(self.seeded.section_ids)
+        student_ids = self.rng.sample(self.seeded.student_ids, min(5, len(self.seeded.student_ids)))
+        return Call(
+            "POST /sections/{section_id}/enroll/bulk",
+            "POST",
+            f"/sections/{section_id}/enroll/bulk",
+            {"student_ids": student_ids},
+        )
+
+
+def plan(seeded: Seeded, mix: str, total: int, random_seed: int, dialect: str) -> List[Call]:
+    rng = random.Random(random_seed)
+    workload = Workload(seeded, rng)
+    actions = [
+        (name, weight) for name, weight in MIXES[mix] if dialect == "postgresql" or name not in POSTGRES_ONLY
+    ]
+    names = rng.choices([name for name, _ in actions], weights=[weight for _, weight in actions], k=total)
+    return [getattr(workload, name)() for name in names]
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    return round(latencies[max(int(len(latencies) * fraction) - 1, 0)] * 1000, 2)
+
+
+def use_sqlite(path: str) -> Tuple[Engine, AsyncEngine]:
+    """Point the app's session factories at a fresh SQLite file and migrate it."""
+
+    @compiles(TSVECTOR, "sqlite")
+    def _tsvector(element, compiler, **kw):
+        return "TEXT"
+
+    @compiles(Computed, "sqlite")
+    def _computed(element, compiler, **kw):
+        # The generated expression is Postgres SQL; the column stays empty on SQLite.
+        return ""
+
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 30})
+    for target in (sync_engine, async_engine.sync_engine):
+        event.listen(target, "connect", _sqlite_pragmas)
+        instrument_engine(target)
+    db_connection.SessionLocal.configure(bind=sync_engine)
+    db_connection.AsyncSessionLocal.configure(bind=async_engine)
+    migrate(sync_engine)
+    return sync_engine, async_engine
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def cleanup(connection: Connection, seeded: Seeded) -> None:
+    user_ids = seeded.student_ids + seeded.teacher_ids
+    for start in range(0, len(user_ids), 5000):
+        chunk = user_ids[start : start + 5000]
+        connection.execute(delete(StudentSection).where(StudentSection.student_id.in_(chunk)))
+    connection.execute(delete(Book).where(Book.course_id.in_(seeded.course_ids)))
+    connection.execute(delete(Course).where(Course.id.in_(seeded.course_ids)))
+    connection.execute(delete(Section).where(Section.id.in_(seeded.section_ids)))
+    connection.execute(delete(Grade).where(Grade.id.in_(seeded.grade_ids)))
+    for start in range(0, len(user_ids), 5000):
+        connection.execute(delete(User).where(User.id.in_(user_ids[start : start + 5000])))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def replay(
+    calls: List[Call], concurrency: int, warmup: int
+) -> Tuple[float, Dict[str, List[float]], Dict[str, Counter]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    etags: Dict[str, str] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async def one(client: httpx.AsyncClient, call: Call, record: bool) -> None:
+        headers = dict(call.headers)
+        if call.revalidate and call.url in etags:
+            headers["If-None-Match"] = etags[call.url]
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(call.method, call.url, json=call.json, headers=headers)
+            elapsed = time.perf_counter() - start
+        if "etag" in response.headers:
+            etags[call.url] = response.headers["etag"]
+        if record:
+            latencies[call.route].append(elapsed)
+            statuses[call.route][response.status_code] += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await asyncio.gather(*(one(client, call, False) for call in calls[:warmup]))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, call, True) for call in calls[warmup:]))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, statuses
+
+
+def report(elapsed: float, latencies: Dict[str, List[float]], statuses: Dict[str, Counter]) -> dict:
+    routes = {}
+    for route in sorted(latencies):
+        timings = sorted(latencies[route])
+        routes[route] = {
+            "requests": len(timings),
+            "errors": sum(count for code, count in statuses[route].items() if code >= 400),
+            "statuses": {str(code): count for code, count in sorted(statuses[route].items())},
+            "throughput_rps": round(len(timings) / elapsed, 1),
+            "p50_ms": round(statistics.median(timings) * 1000, 2),
+            "p95_ms": percentile(timings, 0.95),
+            "p99_ms": percentile(timings, 0.99),
+        }
+    every = sorted(timing for timings in latencies.values() for timing in timings)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(every) / elapsed, 1),
+        "p50_ms": round(statistics.median(every) * 1000, 2),
+        "p95_ms": percentile(every, 0.95),
+        "p99_ms": percentile(every, 0.99),
+        "routes": routes,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    sqlite_path = None
+    if args.database == "sqlite":
+        sqlite_path = args.sqlite_path or tempfile.mktemp(prefix="load-", suffix=".db")
+        seed_engine, async_engine = use_sqlite(sqlite_path)
+    else:
+        seed_engine, async_engine = db_connection.engine, db_connection.async_engine
+
+    scale = Scale.scaled(args.scale)
+    with seed_engine.begin() as connection:
+        seeded = seed(connection, scale, args.seed)
+    calls = plan(seeded, args.mix, args.warmup + args.requests, args.seed, seed_engine.dialect.name)
+
+    async def measure():
+        try:
+            return await replay(calls, args.concurrency, args.warmup)
+        finally:
+            await async_engine.dispose()
+
+    try:
+        elapsed, latencies, statuses = asyncio.run(measure())
+    finally:
+        shutdown_hash_executor()
+        if sqlite_path is None:
+            with seed_engine.begin() as connection:
+                cleanup(connection, seeded)
+        elif not args.sqlite_path:
+            seed_engine.dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(sqlite_path + suffix):
+                    os.remove(sqlite_path + suffix)
+
+    return {
+        "commit": _git_commit(),
+        "mix": args.mix,
+        "database": seed_engine.dialect.name,
+        "scale": args.scale,
+        "seed": args.seed,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rows": {
+            "grades": len(seeded.grade_ids),
+            "sections": len(seeded.section_ids),
+            "courses": len(seeded.course_ids),
+            "books": len(seeded.book_ids),
+            "students": len(seeded.student_ids),
+        },
+        **report(elapsed, latencies, statuses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="weekday")
+    parser.add_argument("--database", choices=["postgres", "sqlite"], default="postgres")
+    parser.add_argument("--sqlite-path", default=None, help="keep the SQLite database at this path")
+    parser.add_argument("--scale", type=float, default=0.1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    result = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(result + "\n")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
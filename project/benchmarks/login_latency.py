@@ -0,0 +1,102 @@
+"""Login latency (p50/p95/p99) under concurrent load, through the full ASGI app.
+
+Seeds ``--users`` accounts tagged with a random email domain, fires ``--requests``
+``POST /auth/login`` calls with ``--concurrency`` in flight against the app
+in-process, then deletes the accounts. Every request includes credential lookup,
+bcrypt verification in the hash process pool and token issuance. Use
+PASSWORD_HASH_ROUNDS and PASSWORD_HASH_WORKERS to compare settings.
+
+Run from ``project/``::
+
+    python -m benchmarks.login_latency --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.security import hash_password, shutdown_hash_executor
+from app.database.connection import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models.user import User
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    return round(latencies[max(int(len(latencies) * fraction) - 1, 0)] * 1000, 2)
+
+
+async def run(users: int, total: int, concurrency: int) -> dict:
+    domain = f"login-{secrets.token_hex(3)}.example.com"
+    emails = [f"user{n}@{domain}" for n in range(users)]
+    password_hash = hash_password(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(User),
+            [
+                {"full_name": f"User {n}", "email": email, "password_hash": password_hash, "role": "student"}
+                for n, email in enumerate(emails)
+            ],
+        )
+        await db.commit()
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async def one(client: httpx.AsyncClient, n: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/auth/login", json={"email": emails[n % users], "password": PASSWORD}
+            )
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(client, n) for n in range(total)))
+            elapsed = time.perf_counter() - start
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.email.like(f"%@{domain}")))
+            await db.commit()
+        await async_engine.dispose()
+        shutdown_hash_executor()
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "hash_rounds": settings.password_hash_rounds,
+        "hash_workers": settings.password_hash_workers,
+        "statuses": dict(statuses),
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.users, args.requests, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
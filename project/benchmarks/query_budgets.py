@@ -0,0 +1,109 @@
+"""Check the query budget of hot read endpoints with ``query_budget``.
+
+Seeds a small catalog in a throwaway SQLite database (see ``benchmarks.load``),
+requests each endpoint once, on a cold cache, inside ``query_budget`` and
+reports the statements it ran. A control request under a budget that is too
+small must fail, which shows that the statements of a real request are counted.
+Exits non-zero when any check fails.
+
+Run from ``project/``::
+
+    python -m benchmarks.query_budgets
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import List, Tuple
+
+import httpx
+
+from app.core.instrumentation import query_budget
+from app.core.security import shutdown_hash_executor
+from app.main import app
+from benchmarks.load import use_sqlite
+from benchmarks.seed import Scale, Seeded, seed
+
+# Route, URL template and the most statements one request may run.
+BUDGETS: List[Tuple[str, str, int]] = [
+    ("GET /courses/{course_id}/books/", "/courses/{course_id}/books/", 2),
+    ("GET /sections/{section_id}/students", "/sections/{section_id}/students?limit=20", 2),
+    ("GET /sections/{section_id}/students?sort=name", "/sections/{section_id}/students?sort=name", 2),
+    ("GET /grades/{grade_id}/tree", "/grades/{grade_id}/tree", 5),
+]
+
+
+async def check(seeded: Seeded) -> dict:
+    ids = {
+        "course_id": seeded.course_ids[0],
+        "section_id": seeded.section_ids[0],
+        "grade_id": seeded.grade_ids[0],
+    }
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        for route, url, budget in BUDGETS:
+            try:
+                with query_budget(budget) as measured:
+                    response = await client.get(url.format(**ids))
+                error = None
+            except AssertionError as exc:
+                error = str(exc)
+            queries = max((stats.queries for _, stats in measured.requests), default=0)
+            results[route] = {
+                "status": response.status_code,
+                "queries": queries,
+                "budget": budget,
+                "ok": error is None and response.status_code == 200,
+                **({"error": error} if error else {}),
+            }
+
+        # Control: the same request must break a budget one below what it uses.
+        route, url, _ = BUDGETS[0]
+        control_budget = results[route]["queries"] - 1
+        try:
+            with query_budget(control_budget):
+                await client.get(url.format(**ids))
+            caught = False
+        except AssertionError:
+            caught = True
+        results["control"] = {"route": route, "budget": control_budget, "ok": caught}
+    return results
+
+
+def run(args: argparse.Namespace) -> dict:
+    path = tempfile.mktemp(prefix="budgets-", suffix=".db")
+    seed_engine, async_engine = use_sqlite(path)
+    try:
+        with seed_engine.begin() as connection:
+            seeded = seed(connection, Scale.scaled(args.scale))
+
+        async def measure() -> dict:
+            try:
+                return await check(seeded)
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(measure())
+    finally:
+        shutdown_hash_executor()
+        seed_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.02)
+    args = parser.parse_args()
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if not all(result["ok"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Seed a realistic school catalog through the application's models.
+
+Every generated name and email carries a random run tag, so repeated runs do
+not collide with each other or with real rows. Rows are bulk-inserted, so the
+``book_count`` and ``student_count`` counters are filled in here rather than by
+the services.
+"""
+import random
+import secrets
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.engine import Connection
+
+from app.core.security import hash_password
+from app.models.book import Book
+from app.models.course import Course
+from app.models.grade import Grade
+from app.models.section import Section
+from app.models.student_section import StudentSection
+from app.models.user import User
+
+SEED_PASSWORD = "benchmark-password"
+CHUNK_SIZE = 5000
+
+CATEGORIES = ["Matematica", "Ciencias", "Historia", "Lenguaje", "Arte", "Ingles", None]
+WORDS = [
+    "algebra", "geometria", "biologia", "quimica", "historia", "literatura", "gramatica",
+    "fisica", "arte", "musica", "geografia", "economia", "ingles", "programacion",
+]
+
+
+@dataclass
+class Scale:
+    grades: int = 12
+    sections_per_grade: int = 6
+    courses_per_section: int = 10
+    books_per_course: int = 40
+    teachers: int = 300
+    students: int = 5000
+    sections_per_student: int = 1
+
+    @classmethod
+    def scaled(cls, factor: float) -> "Scale":
+        base = cls()
+        return cls(
+            grades=max(1, round(base.grades * min(factor, 1))),
+            sections_per_grade=base.sections_per_grade,
+            courses_per_section=base.courses_per_section,
+            books_per_course=max(1, round(base.books_per_course * factor)),
+            teachers=max(1, round(base.teachers * factor)),
+            students=max(1, round(base.students * factor)),
+            sections_per_student=base.sections_per_student,
+        )
+
+
+@dataclass
+class Seeded:
+    tag: str
+    grade_ids: List[int] = field(default_factory=list)
+    section_ids: List[int] = field(default_factory=list)
+    course_ids: List[int] = field(default_factory=list)
+    book_ids: List[int] = field(default_factory=list)
+    teacher_ids: List[int] = field(default_factory=list)
+    student_ids: List[int] = field(default_factory=list)
+    student_emails: Dict[int, str] = field(default_factory=dict)
+
+
+def _insert(connection: Connection, model, rows: List[dict]) -> List[int]:
+    ids: List[int] = []
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for start in range(0, len(rows), CHUNK_SIZE):
+        ids.extend(connection.scalars(statement, rows[start : start + CHUNK_SIZE]))
+    return ids
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(connection: Connection, scale: Scale, random_seed: int = 42) -> Seeded:
+    rng = random.Random(random_seed)
+    seeded = Seeded(tag=secrets.token_hex(3))
+    password_hash = hash_password(SEED_PASSWORD)
+
+    teacher_rows = [
+        {
+            "full_name": f"Docente {n} {seeded.tag}",
+            "email": f"teacher{n}.{seeded.tag}@example.com",
+            "password_hash": password_hash,
+            "role": "teacher",
+        }
+        for n in range(scale.teachers)
+    ]
+    seeded.teacher_ids = _insert(connection, User, teacher_rows)
+
+    student_rows = [
+        {
+            "full_name": f"Estudiante {n} {seeded.tag}",
+            "email": f"student{n}.{seeded.tag}@example.com",
+            "password_hash": password_hash,
+            "role": "student",
+        }
+        for n in range(scale.students)
+    ]
+    seeded.student_ids = _insert(connection, User, student_rows)
+    seeded.student_emails = {
+        user_id: row["email"] for user_id, row in zip(seeded.student_ids, student_rows)
+    }
+
+    seeded.grade_ids = _insert(
+        connection, Grade, [{"name": f"Grado {n} {seeded.tag}"} for n in range(scale.grades)]
+    )
+    seeded.section_ids = _insert(
+        connection,
+        Section,
+        [
+            {"name": f"Seccion {chr(65 + n % 26)}", "grade_id": grade_id}
+            for grade_id in seeded.grade_ids
+            for n in range(scale.sections_per_grade)
+        ],
+    )
+    seeded.course_ids = _insert(
+        connection,
+        Course,
+        [
+            {
+                "name": f"Curso {n} {_sentence(rng, 1)}",
+                "section_id": section_id,
+                "teacher_id": rng.choice(seeded.teacher_ids),
+                "book_count": scale.books_per_course,
+            }
+            for section_id in seeded.section_ids
+            for n in range(scale.courses_per_section)
+        ],
+    )
+    seeded.book_ids = _insert(
+        connection,
+        Book,
+        [
+            {
+                "title": _sentence(rng, 3).title(),
+                "author": f"Autor {rng.randrange(2000)}",
+                "description": _sentence(rng, 12),
+                "file_url": f"https://example.com/{seeded.tag}/{course_id}/{n}.pdf",
+                "category": rng.choice(CATEGORIES),
+                "course_id": course_id,
+                "created_by": rng.choice(seeded.teacher_ids),
+            }
+            for course_id in seeded.course_ids
+            for n in range(scale.books_per_course)
+        ],
+    )
+
+    per_student = min(scale.sections_per_student, len(seeded.section_ids))
+    enrollment_rows = [
+        {"student_id": student_id, "section_id": section_id}
+        for student_id in seeded.student_ids
+        for section_id in rng.sample(seeded.section_ids, per_student)
+    ]
+    _insert(connection, StudentSection, enrollment_rows)
+    student_counts = Counter(row["section_id"] for row in enrollment_rows)
+    if student_counts:
+        connection.execute(
+            update(Section)
+            .where(Section.id == bindparam("section_id"))
+            .values(student_count=bindparam("count")),
+            [
+                {"section_id": section_id, "count": count}
+                for section_id, count in student_counts.items()
+            ],
+        )
+    return seeded
@@ -0,0 +1,102 @@
+"""Per-write latency of add/commit/refresh vs. INSERT/UPDATE ... RETURNING.
+
+Creates and renames grades with both patterns (the grade rows are tagged and
+deleted afterwards) and reports the latency of each write. Both sides run the
+bare write and its commit. The service helpers also apply counters and bump
+``table_versions``, so they are not used here, keeping the difference down to
+RETURNING alone.
+
+Run from ``project/``::
+
+    python -m benchmarks.write_latency --writes 500
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import delete, insert, update
+
+from app.database.connection import AsyncSessionLocal, async_engine
+from app.models.grade import Grade
+
+
+def summarize(latencies: List[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "writes": len(latencies),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+    }
+
+
+async def refresh_pattern(writes: int, tag: str) -> dict:
+    inserts, updates = [], []
+    async with AsyncSessionLocal() as db:
+        for n in range(writes):
+            start = time.perf_counter()
+            grade = Grade(name=f"bench-refresh-{tag}-{n}")
+            db.add(grade)
+            await db.commit()
+            await db.refresh(grade)
+            inserts.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            grade.name = f"bench-refresh-{tag}-{n}-renamed"
+            db.add(grade)
+            await db.commit()
+            await db.refresh(grade)
+            updates.append(time.perf_counter() - start)
+    return {"insert": summarize(inserts), "update": summarize(updates)}
+
+
+async def returning_pattern(writes: int, tag: str) -> dict:
+    inserts, updates = [], []
+    async with AsyncSessionLocal() as db:
+        for n in range(writes):
+            start = time.perf_counter()
+            grade = await db.scalar(
+                insert(Grade).values(name=f"bench-returning-{tag}-{n}").returning(Grade)
+            )
+            await db.commit()
+            inserts.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await db.scalar(
+                update(Grade)
+                .where(Grade.id == grade.id)
+                .values(name=f"bench-returning-{tag}-{n}-renamed")
+                .returning(Grade)
+            )
+            await db.commit()
+            updates.append(time.perf_counter() - start)
+    return {"insert": summarize(inserts), "update": summarize(updates)}
+
+
+async def run(writes: int) -> dict:
+    tag = secrets.token_hex(3)
+    try:
+        return {
+            "commit_refresh": await refresh_pattern(writes, tag),
+            "returning": await returning_pattern(writes, tag),
+        }
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Grade).where(Grade.name.like(f"bench-%-{tag}-%")))
+            await db.commit()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.writes)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -96,10 +96,10 @@ try {
     }
 
     if ($CreateTables) {
-        Write-Host "Creando tablas a partir de los modelos SQLAlchemy..."
-        Push-Location $projectRoot
+        Write-Host "Aplicando migraciones del esquema..."
+        Push-Location (Join-Path $projectRoot "project")
         try {
-            & $PythonExecutable "-c" "from app.database.connection import engine; from app.database.base import Base; import app.models  # noqa: F401; Base.metadata.create_all(bind=engine)"
+            & $PythonExecutable "-m" "app.database.migrations"
             if ($LASTEXITCODE -ne 0) {
                 throw "No fue posible crear las tablas mediante SQLAlchemy."
             }
@@ -97,10 +97,10 @@ else
 fi
 
 if [[ "${CREATE_TABLES,,}" == "true" ]]; then
-  echo "Creando tablas a partir de los modelos SQLAlchemy..."
+  echo "Aplicando migraciones del esquema..."
   (
-    cd "$PROJECT_ROOT"
-    "$PYTHON_EXECUTABLE" -c "from app.database.connection import engine; from app.database.base import Base; import app.models  # noqa: F401; Base.metadata.create_all(bind=engine)"
+    cd "$PROJECT_ROOT/project"
+    "$PYTHON_EXECUTABLE" -m app.database.migrations
   )
   echo "Tablas creadas o actualizadas correctamente."
 fi